@@ -175,6 +175,15 @@ MAX_FILE_SIZE = config('MAX_FILE_SIZE', default=5 * 1024 * 1024, cast=int)  # 5M
 MAX_UPLOADS_PER_DAY = config('MAX_UPLOADS_PER_DAY', default=5, cast=int)
 FILE_TTL_HOURS = config('FILE_TTL_HOURS', default=24, cast=int)
 
+# Stream every upload to a temporary file instead of buffering small ones in
+# memory. Storage then moves the temp file into MEDIA_ROOT rather than copying
+# it, and analysis/processing tasks read the workbook from disk.
+FILE_UPLOAD_MAX_MEMORY_SIZE = 0
+
+# When set (e.g. '/protected/'), pipeline downloads are handed to nginx via
+# X-Accel-Redirect to that internal location, which must alias MEDIA_ROOT.
+PIPELINE_DOWNLOAD_ACCEL_PREFIX = config('PIPELINE_DOWNLOAD_ACCEL_PREFIX', default='')
+
 # Celery Configuration
 CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default='redis://localhost:6379/0')
@@ -188,6 +197,19 @@ CELERY_TIMEZONE = TIME_ZONE
 CELERY_TASK_ALWAYS_EAGER = config('CELERY_TASK_ALWAYS_EAGER', default=DEBUG, cast=bool)
 CELERY_TASK_EAGER_PROPAGATES = config('CELERY_TASK_EAGER_PROPAGATES', default=True, cast=bool)
 
+# Memory-heavy openpyxl tasks can go to their own queue so their worker can recycle
+# child processes (RSS is not returned to the OS otherwise). Set CELERY_HEAVY_QUEUE
+# (e.g. to "xlsx_heavy") only where a worker consumes that queue, e.g.:
+#   celery -A excelAi worker -Q xlsx_heavy -c 2 --max-tasks-per-child=1 --max-memory-per-child=1048576
+# next to the default worker (queue "celery") for everything else. The default keeps
+# every task on the default queue, so a single plain worker runs them all.
+CELERY_HEAVY_QUEUE = config('CELERY_HEAVY_QUEUE', default='celery')
+CELERY_TASK_ROUTES = {
+    'excel_analyzer.tasks.analyze_sheets': {'queue': CELERY_HEAVY_QUEUE},
+    'file_manager.tasks.process_spreadsheet_sheet': {'queue': CELERY_HEAVY_QUEUE},
+    'pipeline_execution.tasks.execute_pipeline': {'queue': CELERY_HEAVY_QUEUE},
+}
+
 # Celery Beat Schedule
 CELERY_BEAT_SCHEDULE = {
     'cleanup-expired-files': {
@@ -2,11 +2,11 @@ from __future__ import annotations
 
 import random
 from datetime import date, datetime
-from typing import Any
+from typing import Any, Iterator
 
 from openpyxl import load_workbook
 
-from .services import _extract_column_names, _find_header_row_index, _is_empty_row
+from .services import _extract_column_names, _is_empty_row
 
 
 def parse_truthy_query_flag(value: Any) -> bool:
@@ -48,33 +48,32 @@ def row_to_dict(*, row_index: int, row: tuple[Any, ...], headers: list[str]) ->
     return payload
 
 
-def _iter_non_empty_data_rows(sheet, *, header_row_idx: int):
-    start_row_idx = header_row_idx + 1
-    for row_index, row in enumerate(
-        sheet.iter_rows(min_row=start_row_idx, values_only=True), start=start_row_idx
-    ):
+def _iter_non_empty_data_rows(
+    rows: Iterator[tuple[int, tuple[Any, ...]]]
+) -> Iterator[tuple[int, tuple[Any, ...]]]:
+    for row_index, row in rows:
         if _is_empty_row(row):
             continue
         yield row_index, row
 
 
 def _take_first_rows(
-    sheet, *, header_row_idx: int, limit: int
+    rows: Iterator[tuple[int, tuple[Any, ...]]], *, limit: int
 ) -> list[tuple[int, tuple[Any, ...]]]:
-    rows: list[tuple[int, tuple[Any, ...]]] = []
-    for row_index, row in _iter_non_empty_data_rows(sheet, header_row_idx=header_row_idx):
-        rows.append((row_index, row))
-        if len(rows) >= limit:
+    picked: list[tuple[int, tuple[Any, ...]]] = []
+    for row_index, row in _iter_non_empty_data_rows(rows):
+        picked.append((row_index, row))
+        if len(picked) >= limit:
             break
-    return rows
+    return picked
 
 
 def _reservoir_sample_rows(
-    sheet, *, header_row_idx: int, limit: int
+    rows: Iterator[tuple[int, tuple[Any, ...]]], *, limit: int
 ) -> list[tuple[int, tuple[Any, ...]]]:
     reservoir: list[tuple[int, tuple[Any, ...]]] = []
     seen = 0
-    for row_index, row in _iter_non_empty_data_rows(sheet, header_row_idx=header_row_idx):
+    for row_index, row in _iter_non_empty_data_rows(rows):
         seen += 1
         if len(reservoir) < limit:
             reservoir.append((row_index, row))
@@ -95,7 +94,14 @@ def preview_rows_for_processed_file(
     random_sample: bool,
     limit: int = 10,
 ) -> dict[str, Any]:
-    wb = load_workbook(original_path, read_only=True, data_only=True)
+    wb = load_workbook(
+        original_path,
+        read_only=True,
+        data_only=True,
+        keep_links=False,
+        keep_vba=False,
+        rich_text=False,
+    )
     try:
         if selected_sheet not in wb.sheetnames:
             raise ValueError(
@@ -103,23 +109,28 @@ def preview_rows_for_processed_file(
                 f'Available sheets: {", ".join(wb.sheetnames)}'
             )
 
+        # Single pass over the sheet: the header is the first non-empty row and
+        # the same iterator continues into the data rows.
+        # Ignore the declared dimensions; a bogus <dimension> would otherwise pad
+        # the iteration with empty rows and columns.
         sheet = wb[selected_sheet]
-        header_row_idx = _find_header_row_index(sheet)
-        if header_row_idx is None:
+        sheet.reset_dimensions()
+        rows = enumerate(sheet.iter_rows(values_only=True), start=1)
+        header_row = next((row for _, row in rows if not _is_empty_row(row)), None)
+        if header_row is None:
             return {"sheet_name": selected_sheet, "header": [], "rows": [], "total_rows": 0}
 
-        header_row = next(
-            sheet.iter_rows(
-                min_row=header_row_idx, max_row=header_row_idx, values_only=True
-            )
-        )
-        headers = make_unique_headers(_extract_column_names(header_row))
-
         picked = (
-            _reservoir_sample_rows(sheet, header_row_idx=header_row_idx, limit=limit)
+            _reservoir_sample_rows(rows, limit=limit)
             if random_sample
-            else _take_first_rows(sheet, header_row_idx=header_row_idx, limit=limit)
+            else _take_first_rows(rows, limit=limit)
         )
+
+        # Rows are not padded to the sheet width, so widen the header to the
+        # widest row returned.
+        width = max([len(header_row)] + [len(row) for _, row in picked])
+        header_row = tuple(header_row) + (None,) * (width - len(header_row))
+        headers = make_unique_headers(_extract_column_names(header_row))
         rows = [row_to_dict(row_index=idx, row=row, headers=headers) for idx, row in picked]
 
         return {
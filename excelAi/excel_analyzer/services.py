@@ -1,10 +1,30 @@
 """
 Business logic for Excel file analysis.
 """
+import hashlib
+import re
+from itertools import islice
 from openpyxl import load_workbook
-from typing import Dict, Any, Union, List, Optional
+from typing import Dict, Any, Union, List, Optional, Iterable, Iterator, Sequence, Tuple
+from django.core.cache import cache
 from django.core.files.uploadedfile import UploadedFile
-from datetime import datetime
+from datetime import date, datetime
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:  # openpyxl is used as the reader when calamine is unavailable
+    CalamineWorkbook = None
+
+
+# Number of non-empty values per column used to infer its type.
+TYPE_INFERENCE_SAMPLE_SIZE = 200
+
+# Upper bound on data rows scanned per sheet, so a sheet with a sparse column
+# cannot make the analysis read an arbitrarily large worksheet.
+MAX_SCANNED_ROWS = 1_000_000
+
+# How long (seconds) analysis results are cached per file content hash.
+SHEETS_CACHE_TIMEOUT = 3600
 
 
 def _filter_non_empty_values(values: List[Any]) -> List[Any]:
@@ -20,32 +40,18 @@ def _filter_non_empty_values(values: List[Any]) -> List[Any]:
     return [v for v in values if v is not None and v != '']
 
 
-def _is_numeric_value(value: Any) -> bool:
-    """
-    Check if a value is numeric (int, float, or numeric string).
-    
-    Args:
-        value: Value to check
-        
-    Returns:
-        True if value is numeric, False otherwise
-    """
-    if isinstance(value, (int, float)):
-        return True
-    
-    if isinstance(value, str):
-        try:
-            float(value.replace(',', ''))
-            return True
-        except (ValueError, AttributeError):
-            return False
-    
-    return False
+# Date string formats recognised during type inference, grouped by separator.
+_DASH_DATE_FORMATS = ('%Y-%m-%d',)
+_SLASH_DATE_FORMATS = ('%d/%m/%Y', '%m/%d/%Y')
+
+# Shapes of the strings the formats above can parse; anything else is
+# rejected without calling strptime.
+_DATE_RE = re.compile(r'\d{4}-\d{1,2}-\d{1,2}|\d{1,2}/\d{1,2}/\d{4}')
 
 
 def _is_date_value(value: Any) -> bool:
     """
-    Check if a value is a date (datetime object or date string).
+    Check if a value is a date (date/datetime object or date string).
     
     Args:
         value: Value to check
@@ -53,11 +59,14 @@ def _is_date_value(value: Any) -> bool:
     Returns:
         True if value is a date, False otherwise
     """
-    if isinstance(value, datetime):
+    if isinstance(value, (datetime, date)):
         return True
     
     if isinstance(value, str):
-        date_formats = ['%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y']
+        # Supported shapes are 8-10 characters long (e.g. 1/1/2020 .. 2020-01-01).
+        if not 8 <= len(value) <= 10 or not _DATE_RE.fullmatch(value):
+            return False
+        date_formats = _DASH_DATE_FORMATS if '-' in value else _SLASH_DATE_FORMATS
         for date_format in date_formats:
             try:
                 datetime.strptime(value, date_format)
@@ -68,51 +77,41 @@ def _is_date_value(value: Any) -> bool:
     return False
 
 
-def _count_numeric_values(values: List[Any]) -> int:
+def _classify_values(values: List[Any]) -> Tuple[int, int, int, int]:
     """
-    Count how many values in the list are numeric.
+    Count boolean, date and numeric values in a single pass.
     
-    Args:
-        values: List of values to check
-        
-    Returns:
-        Number of numeric values
-    """
-    count = 0
-    for value in values:
-        if _is_numeric_value(value):
-            count += 1
-    return count
-
-
-def _count_date_values(values: List[Any]) -> int:
-    """
-    Count how many values in the list are dates.
+    Booleans are not counted as numbers even though bool is a subclass of
+    int, and strings are only tried as numbers when they do not parse as dates.
     
     Args:
-        values: List of values to check
+        values: List of non-empty values to check
         
     Returns:
-        Number of date values
+        Tuple of (bool_count, date_count, number_count, total)
     """
-    count = 0
+    bool_count = 0
+    date_count = 0
+    number_count = 0
+    
     for value in values:
-        if _is_date_value(value):
-            count += 1
-    return count
-
-
-def _count_boolean_values(values: List[Any]) -> int:
-    """
-    Count how many values in the list are booleans.
+        if isinstance(value, bool):
+            bool_count += 1
+        elif isinstance(value, (int, float)):
+            number_count += 1
+        elif isinstance(value, (datetime, date)):
+            date_count += 1
+        elif isinstance(value, str):
+            if _is_date_value(value):
+                date_count += 1
+                continue
+            try:
+                float(value.replace(',', ''))
+                number_count += 1
+            except ValueError:
+                pass
     
-    Args:
-        values: List of values to check
-        
-    Returns:
-        Number of boolean values
-    """
-    return sum(1 for v in values if isinstance(v, bool))
+    return bool_count, date_count, number_count, len(values)
 
 
 def _determine_type_from_counts(
@@ -163,10 +162,9 @@ def _determine_column_type(values: List[Any]) -> Optional[str]:
     if not non_empty_values:
         return None
     
-    bool_count = _count_boolean_values(non_empty_values)
-    date_count = _count_date_values(non_empty_values)
-    number_count = _count_numeric_values(non_empty_values)
-    total = len(non_empty_values)
+    sample = non_empty_values[:TYPE_INFERENCE_SAMPLE_SIZE]
+    
+    bool_count, date_count, number_count, total = _classify_values(sample)
     
     return _determine_type_from_counts(total, bool_count, date_count, number_count)
 
@@ -181,7 +179,11 @@ def _is_empty_row(row: tuple) -> bool:
     Returns:
         True if row is empty, False otherwise
     """
-    return all(cell is None or cell == '' for cell in row)
+    # Plain loop returns on the first non-empty cell without generator overhead.
+    for cell in row:
+        if cell is not None and cell != '':
+            return False
+    return True
 
 
 def _get_sample_data(values: List[Any], max_samples: int = 5) -> List[Any]:
@@ -204,9 +206,12 @@ def _get_sample_data(values: List[Any], max_samples: int = 5) -> List[Any]:
     # Convert to JSON-serializable format
     result = []
     for sample in samples:
-        if isinstance(sample, datetime):
-            # Convert datetime to ISO format string
+        if isinstance(sample, (datetime, date)):
+            # Convert date/datetime to ISO format string
             result.append(sample.isoformat())
+        elif isinstance(sample, float) and sample.is_integer():
+            # calamine reports every numeric cell as float; keep whole numbers as int
+            result.append(int(sample))
         elif isinstance(sample, (int, float, bool, str)):
             result.append(sample)
         else:
@@ -216,22 +221,6 @@ def _get_sample_data(values: List[Any], max_samples: int = 5) -> List[Any]:
     return result
 
 
-def _find_header_row_index(sheet) -> Optional[int]:
-    """
-    Find the index of the first non-empty row in a sheet (header row).
-    
-    Args:
-        sheet: OpenPyXL worksheet object
-        
-    Returns:
-        Row index (1-based) of the header row, or None if sheet is empty
-    """
-    for idx, row in enumerate(sheet.iter_rows(values_only=True), start=1):
-        if not _is_empty_row(row):
-            return idx
-    return None
-
-
 def _extract_column_names(header_row: tuple) -> List[str]:
     """
     Extract column names from the header row.
@@ -244,7 +233,9 @@ def _extract_column_names(header_row: tuple) -> List[str]:
     """
     column_names = []
     for i, cell in enumerate(header_row):
-        if cell is not None:
+        if isinstance(cell, float) and cell.is_integer():
+            column_name = str(int(cell))
+        elif cell is not None and cell != '':
             column_name = str(cell)
         else:
             column_name = f'Column_{i+1}'
@@ -252,45 +243,60 @@ def _extract_column_names(header_row: tuple) -> List[str]:
     return column_names
 
 
-def _collect_column_data(sheet, header_row_idx: int, num_columns: int) -> Dict[int, List[Any]]:
+def _collect_column_data(rows: Iterable[Sequence[Any]], num_columns: int) -> List[List[Any]]:
     """
-    Collect data for each column from the sheet, skipping empty rows.
+    Collect the non-empty values of each column from the data rows.
+    
+    Values are stored per column position (one list per column). A column
+    stops collecting once it holds TYPE_INFERENCE_SAMPLE_SIZE values, and
+    reading stops as soon as every column is full or MAX_SCANNED_ROWS rows
+    have been read. Rows wider than num_columns add columns, since rows read
+    without declared dimensions are not padded to the sheet width.
     
     Args:
-        sheet: OpenPyXL worksheet object
-        header_row_idx: Index of the header row (1-based)
+        rows: Iterable of row value tuples/lists following the header row
         num_columns: Number of columns to collect data for
         
     Returns:
-        Dictionary mapping column index to list of values
+        List of non-empty values for each column, indexed by column position
     """
-    column_data = {i: [] for i in range(num_columns)}
+    column_data: List[List[Any]] = [[] for _ in range(num_columns)]
+    columns_remaining = num_columns
     
-    for row in sheet.iter_rows(min_row=header_row_idx + 1, values_only=True):
-        if _is_empty_row(row):
-            continue
+    for row in islice(rows, MAX_SCANNED_ROWS):
+        if len(row) > len(column_data):
+            columns_remaining += len(row) - len(column_data)
+            column_data.extend([] for _ in range(len(row) - len(column_data)))
+        
+        for column_values, cell_value in zip(column_data, row):
+            if cell_value is None or cell_value == '':
+                continue
+            if len(column_values) >= TYPE_INFERENCE_SAMPLE_SIZE:
+                continue
+            
+            column_values.append(cell_value)
+            if len(column_values) == TYPE_INFERENCE_SAMPLE_SIZE:
+                columns_remaining -= 1
         
-        for col_idx, cell_value in enumerate(row):
-            if col_idx < num_columns:
-                column_data[col_idx].append(cell_value)
+        if columns_remaining == 0:
+            break
     
     return column_data
 
 
-def _process_columns(column_names: List[str], column_data: Dict[int, List[Any]]) -> List[Dict[str, Any]]:
+def _process_columns(column_names: List[str], column_data: List[List[Any]]) -> List[Dict[str, Any]]:
     """
     Process columns to determine types and extract sample data.
     
     Args:
         column_names: List of column names
-        column_data: Dictionary mapping column index to list of values
+        column_data: List of non-empty values for each column position
         
     Returns:
         List of column dictionaries with name, type, and sample_data
     """
     columns = []
-    for col_idx, col_name in enumerate(column_names):
-        column_values = column_data.get(col_idx, [])
+    for col_name, column_values in zip(column_names, column_data):
         column_type = _determine_column_type(column_values)
         sample_data = _get_sample_data(column_values)
         
@@ -303,28 +309,32 @@ def _process_columns(column_names: List[str], column_data: Dict[int, List[Any]])
     return columns
 
 
-def _process_sheet(sheet, sheet_name: str) -> Dict[str, Any]:
+def _process_rows(rows: Iterable[Sequence[Any]], sheet_name: str) -> Dict[str, Any]:
     """
-    Process a single sheet to extract column information.
+    Process the rows of a single sheet to extract column information.
+    
+    The rows are consumed in a single pass: the first non-empty row is the
+    header and the same iterator then continues into the data rows.
     
     Args:
-        sheet: OpenPyXL worksheet object
+        rows: Iterable of row value tuples/lists, starting at the first sheet row
         sheet_name: Name of the sheet
         
     Returns:
         Dictionary with sheet name and columns
     """
-    header_row_idx = _find_header_row_index(sheet)
+    rows = iter(rows)
+    header_row = next((row for row in rows if not _is_empty_row(row)), None)
     
-    if header_row_idx is None:
+    if header_row is None:
         return {
             'name': sheet_name,
             'columns': []
         }
     
-    header_row = list(sheet.iter_rows(min_row=header_row_idx, max_row=header_row_idx, values_only=True))[0]
     column_names = _extract_column_names(header_row)
-    column_data = _collect_column_data(sheet, header_row_idx, len(column_names))
+    column_data = _collect_column_data(rows, len(column_names))
+    column_names += [f'Column_{i+1}' for i in range(len(column_names), len(column_data))]
     columns = _process_columns(column_names, column_data)
     
     return {
@@ -333,25 +343,176 @@ def _process_sheet(sheet, sheet_name: str) -> Dict[str, Any]:
     }
 
 
-def list_excel_sheets(file: UploadedFile) -> Dict[str, Any]:
+def _iter_calamine_rows(sheet) -> Iterator[List[Any]]:
     """
-    Read an Excel file and return columns with types for each sheet.
+    Lazily yield the rows of a calamine sheet, aligned to column A.
+    
+    Rows are converted to Python one at a time, so sampling can stop early
+    without building the whole sheet. iter_rows() starts at the first used
+    column, so leading empty columns are padded back (as
+    to_python(skip_empty_area=False) would).
     
     Args:
-        file: Django uploaded file object
+        sheet: CalamineSheet to read
+        
+    Yields:
+        Row values as lists
+    """
+    if sheet.start is None:  # Empty sheet
+        return
+    padding = [''] * sheet.start[1]
+    for row in sheet.iter_rows():
+        yield padding + row if padding else row
+
+
+def _load_workbook_read_only(file):
+    """
+    Open a workbook with openpyxl for value-only reading.
+    
+    External links, VBA and rich text are skipped since only cell values are
+    read. Callers must close the workbook to release the underlying file.
+    
+    Args:
+        file: Path or file-like object
         
     Returns:
-        Dictionary containing sheets with their columns and types
+        Read-only openpyxl workbook
+    """
+    return load_workbook(
+        file,
+        read_only=True,
+        data_only=True,
+        keep_links=False,
+        keep_vba=False,
+        rich_text=False,
+    )
+
+
+def _list_sheets_with_calamine(path: str) -> List[Dict[str, Any]]:
+    """
+    Read all sheets using the calamine (Rust) reader (.xlsx and .xls).
+    
+    Rows come back as native Python values (int/float/bool/str/date/datetime)
+    and are streamed, so only the sampled rows are converted.
+    
+    Args:
+        path: Filesystem path to the workbook
+        
+    Returns:
+        List of sheet dictionaries with their columns
+    """
+    workbook = CalamineWorkbook.from_path(path)
+    try:
+        return [
+            _process_rows(_iter_calamine_rows(workbook.get_sheet_by_name(sheet_name)), sheet_name)
+            for sheet_name in workbook.sheet_names
+        ]
+    finally:
+        workbook.close()
+
+
+def _list_sheets_with_openpyxl(path: str) -> List[Dict[str, Any]]:
     """
-    workbook = load_workbook(file, read_only=True, data_only=True)
+    Read all sheets using openpyxl in read-only mode (.xlsx only).
     
-    sheets = []
-    for sheet_name in workbook.sheetnames:
-        sheet = workbook[sheet_name]
-        sheet_info = _process_sheet(sheet, sheet_name)
-        sheets.append(sheet_info)
+    The declared sheet dimensions are discarded so that a wrong or oversized
+    <dimension> element cannot make openpyxl pad out empty rows and columns.
+    
+    Args:
+        path: Filesystem path to the workbook
+        
+    Returns:
+        List of sheet dictionaries with their columns
+    """
+    workbook = _load_workbook_read_only(path)
+    try:
+        sheets = []
+        for sheet_name in workbook.sheetnames:
+            sheet = workbook[sheet_name]
+            sheet.reset_dimensions()
+            sheets.append(_process_rows(sheet.iter_rows(values_only=True), sheet_name))
+    finally:
+        workbook.close()
+    
+    return sheets
+
+
+def list_excel_sheets_from_path(path: str) -> Dict[str, Any]:
+    """
+    Read the workbook stored at path and return columns with types for each sheet.
+    
+    The workbook is opened once and its sheets are analyzed one after the
+    other. Uses calamine when installed (handles both .xlsx and .xls) and
+    falls back to openpyxl otherwise.
+    
+    Args:
+        path: Filesystem path to the workbook
+        
+    Returns:
+        Dictionary containing sheets with their columns and types
+    """
+    if CalamineWorkbook is not None:
+        sheets = _list_sheets_with_calamine(path)
+    else:
+        sheets = _list_sheets_with_openpyxl(path)
     
     return {
         'sheets': sheets,
         'total_sheets': len(sheets)
     }
+
+
+def _file_digest(file: UploadedFile) -> str:
+    """
+    Compute the SHA-256 hex digest of an uploaded file's content.
+    
+    The file is read in chunks and rewound afterwards so it can be parsed.
+    
+    Args:
+        file: Django uploaded file object
+        
+    Returns:
+        Hex digest string
+    """
+    hasher = hashlib.sha256()
+    for chunk in file.chunks():
+        hasher.update(chunk)
+    file.seek(0)
+    return hasher.hexdigest()
+
+
+def sheets_cache_key(file: UploadedFile) -> str:
+    """
+    Build the cache key under which a file's sheet analysis is stored.
+    
+    Args:
+        file: Django uploaded file object
+        
+    Returns:
+        Cache key derived from the file content hash
+    """
+    return f'sheets:{_file_digest(file)}'
+
+
+def get_cached_sheets(cache_key: str) -> Optional[Dict[str, Any]]:
+    """
+    Return a previously cached sheet analysis, if any.
+    
+    Args:
+        cache_key: Key returned by sheets_cache_key
+        
+    Returns:
+        Cached analysis dictionary or None
+    """
+    return cache.get(cache_key)
+
+
+def cache_sheets(cache_key: str, result: Dict[str, Any]) -> None:
+    """
+    Store a sheet analysis so re-uploads of the same file skip parsing.
+    
+    Args:
+        cache_key: Key returned by sheets_cache_key
+        result: Analysis returned by list_excel_sheets_from_path
+    """
+    cache.set(cache_key, result, SHEETS_CACHE_TIMEOUT)
@@ -0,0 +1,45 @@
+"""
+Celery tasks for excel_analyzer app.
+"""
+import logging
+from celery import shared_task
+from file_manager.models import ProcessedFile
+from .services import list_excel_sheets_from_path, cache_sheets
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def analyze_sheets(file_id: str, cache_key: str):
+    """
+    Analyze an uploaded workbook and store its sheets/columns on the file record.
+    
+    Args:
+        file_id: UUID of the ProcessedFile instance
+        cache_key: Content-hash cache key to store the result under
+    """
+    try:
+        logger.info(f'Analyzing file {file_id}')
+        file_record = ProcessedFile.objects.get(file_id=file_id)
+        
+        file_record.status = 'PROCESSING'
+        file_record.save(update_fields=['status'])
+        
+        result = list_excel_sheets_from_path(file_record.original_file.path)
+        
+        file_record.columns_json = result
+        file_record.status = 'READY'
+        file_record.save(update_fields=['columns_json', 'status'])
+        
+        cache_sheets(cache_key, result)
+        
+        logger.info(f'Successfully analyzed file {file_id}')
+        
+    except ProcessedFile.DoesNotExist:
+        logger.error(f'File {file_id} not found')
+        raise
+    except Exception as exc:
+        logger.error(f'Error analyzing file {file_id}: {str(exc)}', exc_info=True)
+        
+        # Parse errors are deterministic, so mark as failed without retrying
+        ProcessedFile.objects.filter(file_id=file_id).update(status='FAILED')
@@ -1,3 +1,154 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from openpyxl import Workbook
+from rest_framework.test import APIClient
+
+from file_manager.models import ProcessedFile
+from file_manager.services import check_upload_limit
+
+from .services import cache_sheets, get_cached_sheets, sheets_cache_key
+from .tasks import analyze_sheets
+
+USER_ID = 'user_1'
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def _xlsx_bytes() -> bytes:
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = 'Data'
+    sheet.append(['name', 'age'])
+    sheet.append(['Ann', 31])
+    sheet.append(['Bob', 42])
+    workbook.create_sheet('Empty')
+    buffer = BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def _upload(content: bytes = None) -> SimpleUploadedFile:
+    return SimpleUploadedFile(
+        'book.xlsx',
+        _xlsx_bytes() if content is None else content,
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    )
+
+
+def _analysis_record(content: bytes) -> ProcessedFile:
+    file_record = ProcessedFile(
+        clerk_user_id=USER_ID,
+        selected_sheet='',
+        expires_at=timezone.now() + timedelta(hours=1),
+    )
+    file_record.original_file.save('book.xlsx', ContentFile(content), save=False)
+    file_record.save()
+    return file_record
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+)
+class AnalyzerTestCase(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+
+
+class AnalyzeSheetsTaskTests(AnalyzerTestCase):
+    def test_stores_analysis_on_record_and_in_cache(self):
+        file_record = _analysis_record(_xlsx_bytes())
+
+        analyze_sheets(str(file_record.file_id), 'sheets:key')
+
+        file_record.refresh_from_db()
+        self.assertEqual(file_record.status, 'READY')
+        self.assertEqual(file_record.columns_json['total_sheets'], 2)
+        data_sheet = file_record.columns_json['sheets'][0]
+        self.assertEqual(data_sheet['name'], 'Data')
+        self.assertEqual(
+            [(column['name'], column['type']) for column in data_sheet['columns']],
+            [('name', 'string'), ('age', 'number')],
+        )
+        self.assertEqual(get_cached_sheets('sheets:key'), file_record.columns_json)
+
+    def test_marks_unreadable_file_failed(self):
+        file_record = _analysis_record(b'not a workbook')
+
+        analyze_sheets(str(file_record.file_id), 'sheets:key')
+
+        file_record.refresh_from_db()
+        self.assertEqual(file_record.status, 'FAILED')
+        self.assertIsNone(get_cached_sheets('sheets:key'))
+
+
+class ListSheetsViewTests(AnalyzerTestCase):
+    url = '/api/analyzer/sheets/'
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient(HTTP_X_CLERK_USER_ID=USER_ID)
+
+    def test_requires_authentication(self):
+        response = APIClient().post(self.url, {'file': _upload()}, format='multipart')
+        self.assertEqual(response.status_code, 401)
+
+    def test_cached_analysis_is_returned_inline(self):
+        upload = _upload()
+        cached = {'sheets': [{'name': 'Data', 'columns': []}], 'total_sheets': 1}
+        cache_sheets(sheets_cache_key(upload), cached)
+
+        with mock.patch('excel_analyzer.views.analyze_sheets') as task:
+            response = self.client.post(self.url, {'file': upload}, format='multipart')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, cached)
+        task.delay.assert_not_called()
+        self.assertFalse(ProcessedFile.objects.exists())
+
+    def test_cache_miss_queues_analysis(self):
+        upload = _upload()
+        cache_key = sheets_cache_key(upload)
+
+        with mock.patch('excel_analyzer.views.analyze_sheets') as task:
+            response = self.client.post(self.url, {'file': upload}, format='multipart')
+
+        self.assertEqual(response.status_code, 202)
+        file_record = ProcessedFile.objects.get(file_id=response.data['file_id'])
+        self.assertEqual(file_record.selected_sheet, '')
+        self.assertEqual(response.data['status'], 'UPLOADED')
+        self.assertEqual(
+            response.data['status_url'], f'/api/files/status/{file_record.file_id}/'
+        )
+        task.delay.assert_called_once_with(str(file_record.file_id), cache_key)
+
+    @override_settings(DEBUG=False, MAX_UPLOADS_PER_DAY=1)
+    def test_analysis_uploads_do_not_count_toward_upload_limit(self):
+        with mock.patch('excel_analyzer.views.analyze_sheets'):
+            response = self.client.post(self.url, {'file': _upload()}, format='multipart')
+        self.assertEqual(response.status_code, 202)
+
+        self.assertTrue(check_upload_limit(USER_ID))
+
+    def test_rows_preview_rejects_analysis_upload(self):
+        file_record = _analysis_record(_xlsx_bytes())
+        file_record.status = 'READY'
+        file_record.save(update_fields=['status'])
+
+        response = self.client.get(f'/api/analyzer/rows/{file_record.file_id}/')
+
+        self.assertEqual(response.status_code, 404)
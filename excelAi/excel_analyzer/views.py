@@ -2,15 +2,28 @@
 Views for Excel analyzer app.
 """
 from django.core.exceptions import PermissionDenied
+from django.urls import reverse
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework import status
 
-from file_manager.exceptions import AuthenticationError, FileNotFoundError
-from file_manager.services import check_authentication, get_file_by_id
+from file_manager.exceptions import (
+    AuthenticationError,
+    FileNotFoundError,
+    FileSizeExceededError,
+    RequestValidationError,
+)
+from file_manager.services import (
+    check_authentication,
+    create_analysis_record,
+    get_file_by_id,
+    require_selected_sheet,
+    validate_file_type,
+)
 
-from .services import list_excel_sheets
+from .services import sheets_cache_key, get_cached_sheets
+from .tasks import analyze_sheets
 from .rows_preview import parse_truthy_query_flag, preview_rows_for_processed_file
 
 
@@ -18,8 +31,21 @@ class ListSheetsView(APIView):
     """
     API endpoint to analyze Excel file and return columns with types for each sheet.
     
-    Expects a POST request with 'file' field containing the Excel file.
-    Returns JSON response with sheets, their columns, and column types.
+    Expects an authenticated POST request with 'file' field containing the
+    Excel file. If the same file was analyzed before, returns the cached
+    analysis (200). Otherwise stores the file, queues the analysis and returns
+    its file_id (202); the result is exposed under 'analysis' by the file
+    status endpoint.
+    
+    Responses:
+        200: {'sheets': [...], 'total_sheets': int} (cached analysis)
+        202: {'file_id': str, 'status': str, 'status_url': str}
+        400: Missing, unsupported or oversized file
+        401: Missing or invalid authentication
+    
+    Clients written against the earlier contract (anonymous request, analysis
+    always returned inline with 200) must send credentials and follow
+    status_url on 202.
     """
     parser_classes = [MultiPartParser, FormParser]
     
@@ -27,6 +53,11 @@ class ListSheetsView(APIView):
         """
         Handle POST request to analyze Excel file and return columns with types.
         """
+        try:
+            clerk_user_id = check_authentication(request)
+        except AuthenticationError as e:
+            return Response({'error': str(e)}, status=status.HTTP_401_UNAUTHORIZED)
+        
         if 'file' not in request.FILES:
             return Response(
                 {'error': 'No file provided. Please upload an Excel file.'},
@@ -35,16 +66,31 @@ class ListSheetsView(APIView):
         
         uploaded_file = request.FILES['file']
         
-        if not uploaded_file.name.endswith(('.xlsx', '.xls')):
-            return Response(
-                {'error': 'Invalid file type. Please upload an Excel file (.xlsx or .xls).'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        try:
+            validate_file_type(uploaded_file)
+        except RequestValidationError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
         try:
-            result = list_excel_sheets(uploaded_file)
+            cache_key = sheets_cache_key(uploaded_file)
+            cached = get_cached_sheets(cache_key)
+            if cached is not None:
+                return Response(cached, status=status.HTTP_200_OK)
+            
+            file_record = create_analysis_record(clerk_user_id, uploaded_file)
+            analyze_sheets.delay(str(file_record.file_id), cache_key)
             
-            return Response(result, status=status.HTTP_200_OK)
+            return Response(
+                {
+                    'file_id': str(file_record.file_id),
+                    'status': file_record.status,
+                    'status_url': reverse('file_manager:file_status', args=[file_record.file_id]),
+                },
+                status=status.HTTP_202_ACCEPTED
+            )
+        
+        except FileSizeExceededError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
         except Exception as e:
             return Response(
@@ -63,7 +109,10 @@ class RowsPreviewView(APIView):
     def get(self, request, file_id):
         try:
             clerk_user_id = check_authentication(request)
-            file_record = get_file_by_id(str(file_id), clerk_user_id)
+            file_record = get_file_by_id(
+                str(file_id), clerk_user_id, fields=("original_file", "selected_sheet")
+            )
+            require_selected_sheet(file_record)
 
             random_sample = parse_truthy_query_flag(request.query_params.get("random"))
             mode = "random" if random_sample else "first"
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-15 10:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('file_manager', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='processedfile',
+            name='columns_json',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-15 11:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('file_manager', '0003_processedfile_columns_json'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='processedfile',
+            name='preserve_styles',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -25,6 +25,10 @@ class ProcessedFile(models.Model):
     processed_file = models.FileField(upload_to='temp/processed/', null=True, blank=True)
     selected_sheet = models.CharField(max_length=255)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='UPLOADED')
+    # Copy cell styles when extracting the selected sheet (slower, opt-in)
+    preserve_styles = models.BooleanField(default=False)
+    # Sheet/column analysis produced by excel_analyzer.tasks.analyze_sheets
+    columns_json = models.JSONField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     last_accessed_at = models.DateTimeField(auto_now=True)
     expires_at = models.DateTimeField()
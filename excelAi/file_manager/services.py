@@ -2,9 +2,12 @@
 Business logic for file_manager app.
 """
 import os
-from typing import Optional
+import uuid
+from typing import List, Optional, Sequence
 from django.core.exceptions import ValidationError, PermissionDenied
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
 from .models import ProcessedFile
@@ -18,6 +21,17 @@ from .exceptions import (
 )
 
 
+# WSGI META key of the X-Clerk-User-Id request header.
+CLERK_USER_ID_HEADER = 'HTTP_X_CLERK_USER_ID'
+
+# Accepted spreadsheet file extensions (lowercase, without the dot).
+ALLOWED_FILE_EXTENSIONS = frozenset({'xlsx', 'xlsm', 'xls'})
+
+# How long (seconds) a user's daily upload count is cached. The key includes
+# the date, so this only needs to outlive the day.
+UPLOAD_COUNT_CACHE_TIMEOUT = 24 * 3600
+
+
 def validate_file_size(file) -> None:
     """
     Validate that file size is within the allowed limit.
@@ -39,6 +53,19 @@ def validate_file_size(file) -> None:
         )
 
 
+def _upload_count_cache_key(clerk_user_id: str) -> str:
+    """
+    Build the cache key holding a user's upload count for the current day.
+    
+    Args:
+        clerk_user_id: Clerk user ID
+        
+    Returns:
+        Cache key
+    """
+    return f'uploads:{clerk_user_id}:{timezone.now().date().isoformat()}'
+
+
 def check_upload_limit(clerk_user_id: str) -> bool:
     """
     Check if user has exceeded daily upload limit.
@@ -56,12 +83,18 @@ def check_upload_limit(clerk_user_id: str) -> bool:
     if settings.DEBUG:
         return True
     
-    today_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    cache_key = _upload_count_cache_key(clerk_user_id)
+    upload_count = cache.get(cache_key)
     
-    upload_count = ProcessedFile.objects.filter(
-        clerk_user_id=clerk_user_id,
-        created_at__gte=today_start
-    ).count()
+    if upload_count is None:
+        today_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        
+        # Sheet-analysis uploads (no selected sheet) don't count toward the limit.
+        upload_count = ProcessedFile.objects.filter(
+            clerk_user_id=clerk_user_id,
+            created_at__gte=today_start
+        ).exclude(selected_sheet='').values('pk').count()
+        cache.set(cache_key, upload_count, UPLOAD_COUNT_CACHE_TIMEOUT)
     
     if upload_count >= settings.MAX_UPLOADS_PER_DAY:
         raise UploadLimitExceededError(
@@ -72,7 +105,25 @@ def check_upload_limit(clerk_user_id: str) -> bool:
     return True
 
 
-def create_file_record(clerk_user_id: str, file, sheet_name: str) -> ProcessedFile:
+def _increment_upload_count(clerk_user_id: str) -> None:
+    """
+    Count a new upload toward the user's cached daily total.
+    
+    Args:
+        clerk_user_id: Clerk user ID
+    """
+    try:
+        cache.incr(_upload_count_cache_key(clerk_user_id))
+    except ValueError:
+        pass  # Count not cached yet; the next check reads it from the database
+
+
+def create_file_record(
+    clerk_user_id: str,
+    file,
+    sheet_name: str,
+    preserve_styles: bool = False
+) -> ProcessedFile:
     """
     Create a new file record after validation.
     
@@ -80,6 +131,7 @@ def create_file_record(clerk_user_id: str, file, sheet_name: str) -> ProcessedFi
         clerk_user_id: Clerk user ID
         file: Django uploaded file object
         sheet_name: Name of the selected sheet
+        preserve_styles: Whether to copy cell styles into the processed file
         
     Returns:
         ProcessedFile instance
@@ -99,20 +151,59 @@ def create_file_record(clerk_user_id: str, file, sheet_name: str) -> ProcessedFi
         clerk_user_id=clerk_user_id,
         original_file=file,
         selected_sheet=sheet_name,
+        preserve_styles=preserve_styles,
         status='UPLOADED',
         expires_at=expires_at
     )
     
+    _increment_upload_count(clerk_user_id)
+    
     return processed_file
 
 
-def get_file_by_id(file_id: str, clerk_user_id: str) -> ProcessedFile:
+def create_analysis_record(clerk_user_id: str, file) -> ProcessedFile:
+    """
+    Create a file record for a sheet-analysis upload.
+    
+    Analysis records have no selected sheet and are not counted toward the
+    daily upload limit.
+    
+    Args:
+        clerk_user_id: Clerk user ID
+        file: Django uploaded file object
+        
+    Returns:
+        ProcessedFile instance
+        
+    Raises:
+        FileSizeExceededError: If file size exceeds limit
+    """
+    validate_file_size(file)
+    
+    expires_at = timezone.now() + timedelta(hours=settings.FILE_TTL_HOURS)
+    
+    return ProcessedFile.objects.create(
+        clerk_user_id=clerk_user_id,
+        original_file=file,
+        selected_sheet='',
+        status='UPLOADED',
+        expires_at=expires_at
+    )
+
+
+def get_file_by_id(
+    file_id: str,
+    clerk_user_id: str,
+    fields: Optional[Sequence[str]] = None
+) -> ProcessedFile:
     """
     Retrieve a file by ID and enforce ownership.
     
     Args:
         file_id: UUID of the file
         clerk_user_id: Clerk user ID
+        fields: Only load these fields (plus the primary key and owner);
+            all fields are loaded when None
         
     Returns:
         ProcessedFile instance
@@ -121,8 +212,12 @@ def get_file_by_id(file_id: str, clerk_user_id: str) -> ProcessedFile:
         FileNotFoundError: If file not found
         PermissionDenied: If user doesn't own the file
     """
+    queryset = ProcessedFile.objects.all()
+    if fields is not None:
+        queryset = queryset.only('clerk_user_id', *fields)
+    
     try:
-        file_obj = ProcessedFile.objects.get(file_id=file_id)
+        file_obj = queryset.get(file_id=file_id)
     except ProcessedFile.DoesNotExist:
         raise FileNotFoundError(f'File with ID {file_id} not found')
     
@@ -130,13 +225,32 @@ def get_file_by_id(file_id: str, clerk_user_id: str) -> ProcessedFile:
     if file_obj.clerk_user_id != clerk_user_id:
         raise PermissionDenied('You do not have permission to access this file')
     
-    # Update last accessed time
+    # Update last accessed time (without loading deferred fields)
     file_obj.last_accessed_at = timezone.now()
-    file_obj.save(update_fields=['last_accessed_at'])
+    ProcessedFile.objects.filter(file_id=file_obj.file_id).update(
+        last_accessed_at=file_obj.last_accessed_at
+    )
     
     return file_obj
 
 
+def require_selected_sheet(file_record: ProcessedFile) -> None:
+    """
+    Reject sheet-analysis uploads where a file with a selected sheet is needed.
+    
+    Analysis records have no selected sheet, so they are treated as missing,
+    like in get_files_for_reprocessing.
+    
+    Args:
+        file_record: ProcessedFile instance loaded with selected_sheet
+        
+    Raises:
+        FileNotFoundError: If the file has no selected sheet
+    """
+    if not file_record.selected_sheet:
+        raise FileNotFoundError(f'File with ID {file_record.file_id} not found')
+
+
 def mark_file_expired(file_id: str) -> None:
     """
     Mark a file as expired.
@@ -171,6 +285,9 @@ def check_authentication(request) -> str:
     """
     Check if request has valid Clerk user ID.
     
+    The ID is only read from the X-Clerk-User-Id header; the request body is
+    never consulted, so checking auth does not trigger body parsing.
+    
     Args:
         request: Django request object
         
@@ -180,12 +297,10 @@ def check_authentication(request) -> str:
     Raises:
         AuthenticationError: If authentication is missing
     """
-    clerk_user_id = request.META.get('HTTP_X_CLERK_USER_ID')
-    if clerk_user_id:
-        clerk_user_id = clerk_user_id.strip()
+    clerk_user_id = (request.META.get(CLERK_USER_ID_HEADER) or '').strip()
     if not clerk_user_id:
         raise AuthenticationError('Authentication required')
-    return clerk_user_id.strip()
+    return clerk_user_id
 
 
 def validate_file_type(file) -> None:
@@ -198,19 +313,23 @@ def validate_file_type(file) -> None:
     Raises:
         RequestValidationError: If file type is invalid
     """
-    if not file.name.endswith(('.xlsx', '.xls')):
-        raise RequestValidationError('Invalid file type. Please upload an Excel file (.xlsx or .xls).')
+    # splitext keeps a bare 'xlsx' name (or '.xlsx' dotfile) extensionless
+    extension = os.path.splitext(file.name)[1].lower().lstrip('.')
+    if not extension or extension not in ALLOWED_FILE_EXTENSIONS:
+        raise RequestValidationError(
+            'Invalid file type. Please upload an Excel file (.xlsx, .xlsm or .xls).'
+        )
 
 
 def validate_upload_request(request) -> tuple:
     """
-    Validate upload request and extract file and sheet name.
+    Validate upload request and extract file, sheet name and options.
     
     Args:
         request: Django request object
         
     Returns:
-        Tuple of (uploaded_file, sheet_name)
+        Tuple of (uploaded_file, sheet_name, preserve_styles)
         
     Raises:
         RequestValidationError: If request is invalid
@@ -223,10 +342,78 @@ def validate_upload_request(request) -> tuple:
     
     uploaded_file = request.FILES['file']
     sheet_name = request.data['sheet_name']
+    preserve_styles = str(request.data.get('preserve_styles', '')).strip().lower() in {
+        '1', 'true', 'yes', 'on'
+    }
     
     validate_file_type(uploaded_file)
     
-    return uploaded_file, sheet_name
+    return uploaded_file, sheet_name, preserve_styles
+
+
+# Fields read by format_file_status_response
+FILE_STATUS_FIELDS = ('status', 'created_at', 'expires_at', 'columns_json')
+
+
+def validate_reprocess_request(request) -> List[str]:
+    """
+    Validate a reprocess request and extract the file IDs.
+    
+    Args:
+        request: Django request object
+        
+    Returns:
+        List of unique file ID strings
+        
+    Raises:
+        RequestValidationError: If file_ids is missing or invalid
+    """
+    file_ids = request.data.get('file_ids')
+    if not isinstance(file_ids, list) or not file_ids:
+        raise RequestValidationError('file_ids must be a non-empty list')
+    
+    try:
+        return list(dict.fromkeys(str(uuid.UUID(str(file_id))) for file_id in file_ids))
+    except ValueError:
+        raise RequestValidationError('file_ids must contain valid UUIDs')
+
+
+def get_files_for_reprocessing(file_ids: List[str], clerk_user_id: str) -> List[ProcessedFile]:
+    """
+    Fetch the user's files to reprocess and reset their status.
+    
+    Args:
+        file_ids: List of file ID strings
+        clerk_user_id: Clerk user ID
+        
+    Returns:
+        List of ProcessedFile instances
+        
+    Raises:
+        FileNotFoundError: If any file is missing, not owned by the user,
+            expired, or is a sheet-analysis upload
+        RequestValidationError: If any file is still being processed
+    """
+    file_ids = list(dict.fromkeys(file_ids))
+    
+    queryset = ProcessedFile.objects.filter(
+        file_id__in=file_ids,
+        clerk_user_id=clerk_user_id,
+        expires_at__gt=timezone.now()
+    ).exclude(selected_sheet='').exclude(status='EXPIRED')
+    
+    # Lock the rows so a worker can't start on a file between the check and the reset
+    with transaction.atomic():
+        files = list(queryset.select_for_update().only('file_id', 'status'))
+        if len(files) != len(file_ids):
+            raise FileNotFoundError('One or more files were not found')
+        
+        if any(file_record.status == 'PROCESSING' for file_record in files):
+            raise RequestValidationError('One or more files are still being processed')
+        
+        queryset.update(status='UPLOADED')
+    
+    return files
 
 
 def format_file_status_response(file_record: ProcessedFile) -> dict:
@@ -239,13 +426,16 @@ def format_file_status_response(file_record: ProcessedFile) -> dict:
     Returns:
         Dictionary with file status information
     """
-    return {
+    data = {
         'file_id': str(file_record.file_id),
         'status': file_record.status,
         'created_at': file_record.created_at.isoformat(),
         'expires_at': file_record.expires_at.isoformat(),
         'is_expired': file_record.is_expired,
     }
+    if file_record.columns_json is not None:
+        data['analysis'] = file_record.columns_json
+    return data
 
 
 def format_upload_response(file_record: ProcessedFile) -> dict:
@@ -285,7 +475,31 @@ def validate_file_for_download(file_record: ProcessedFile) -> None:
         raise FileNotFoundError('Processed file not found')
 
 
-def handle_upload_file(clerk_user_id: str, uploaded_file, sheet_name: str) -> ProcessedFile:
+def get_download_validators(file_record: ProcessedFile) -> tuple:
+    """
+    Build HTTP cache validators for a processed file.
+    
+    The processed file is replaced when a file is reprocessed, so the ETag
+    includes the file's modification time rather than only its ID.
+    
+    Args:
+        file_record: ProcessedFile instance with a processed file
+        
+    Returns:
+        Tuple of (etag, last_modified timestamp)
+    """
+    processed_file = file_record.processed_file
+    last_modified = int(processed_file.storage.get_modified_time(processed_file.name).timestamp())
+    etag = f'W/"{file_record.file_id}-{last_modified}"'
+    return etag, last_modified
+
+
+def handle_upload_file(
+    clerk_user_id: str,
+    uploaded_file,
+    sheet_name: str,
+    preserve_styles: bool = False
+) -> ProcessedFile:
     """
     Handle file upload process: validate and create file record.
     
@@ -293,6 +507,7 @@ def handle_upload_file(clerk_user_id: str, uploaded_file, sheet_name: str) -> Pr
         clerk_user_id: Clerk user ID
         uploaded_file: Django uploaded file object
         sheet_name: Name of the selected sheet
+        preserve_styles: Whether to copy cell styles into the processed file
         
     Returns:
         ProcessedFile instance
@@ -307,7 +522,8 @@ def handle_upload_file(clerk_user_id: str, uploaded_file, sheet_name: str) -> Pr
     file_record = create_file_record(
         clerk_user_id=clerk_user_id,
         file=uploaded_file,
-        sheet_name=sheet_name
+        sheet_name=sheet_name,
+        preserve_styles=preserve_styles
     )
     
     return file_record
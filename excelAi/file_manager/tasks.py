@@ -3,21 +3,124 @@ Celery tasks for file_manager app.
 """
 import os
 import logging
-from copy import copy
-from celery import shared_task
-from django.conf import settings
-from django.core.files.base import ContentFile
+import re
+import shutil
+import uuid
+import zipfile
+from celery import group, shared_task
 from openpyxl import load_workbook, Workbook
 from .models import ProcessedFile
+from .workbook import keep_only_sheet
 
 logger = logging.getLogger(__name__)
 
+# Cell formula element (<f>, <f .../>, or namespace-prefixed) in worksheet XML
+_FORMULA_TAG = re.compile(rb'<(?:\w+:)?f[\s>/]')
+
+
+def _extract_sheet_values(original_path: str, sheet_name: str) -> Workbook:
+    """
+    Stream the values of one sheet into a new write-only workbook.
+    
+    Args:
+        original_path: Path to the original workbook
+        sheet_name: Name of the sheet to extract
+        
+    Returns:
+        Write-only Workbook containing the sheet
+    """
+    workbook = load_workbook(original_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        if sheet_name not in workbook.sheetnames:
+            raise ValueError(
+                f'Sheet "{sheet_name}" not found in workbook. '
+                f'Available sheets: {", ".join(workbook.sheetnames)}'
+            )
+        
+        new_workbook = Workbook(write_only=True)
+        new_sheet = new_workbook.create_sheet(title=sheet_name)
+        for row in workbook[sheet_name].iter_rows(values_only=True):
+            new_sheet.append(row)
+    finally:
+        workbook.close()
+    
+    return new_workbook
+
+
+def _xlsx_has_formulas(path: str) -> bool:
+    """
+    Check whether any worksheet of an .xlsx file contains a formula.
+    
+    The worksheet XML is scanned for <f> elements in chunks, without parsing
+    the workbook.
+    
+    Args:
+        path: Path to the .xlsx file
+        
+    Returns:
+        True if a formula element was found
+    """
+    with zipfile.ZipFile(path) as archive:
+        for part_name in archive.namelist():
+            if not (part_name.startswith('xl/worksheets/') and part_name.endswith('.xml')):
+                continue
+            with archive.open(part_name) as part:
+                tail = b''
+                while chunk := part.read(1 << 20):
+                    if _FORMULA_TAG.search(tail + chunk):
+                        return True
+                    tail = chunk[-16:]  # A tag split across two chunks
+    return False
+
+
+def _write_sheet_with_styles(original_path: str, sheet_name: str, processed_path: str) -> None:
+    """
+    Write a workbook containing only the selected sheet, styles included.
+    
+    Like the values-only path, formulas are replaced by their cached values.
+    A single-sheet .xlsx without formulas is already that, so it is linked
+    (or copied) as is; otherwise the other sheets are removed from the loaded
+    workbook, avoiding a cell-by-cell copy.
+    
+    Args:
+        original_path: Path to the original workbook
+        sheet_name: Name of the sheet to keep
+        processed_path: Path to write the processed workbook to
+    """
+    workbook = load_workbook(original_path, read_only=True, keep_links=False)
+    sheet_names = workbook.sheetnames
+    workbook.close()
+    
+    if sheet_name not in sheet_names:
+        raise ValueError(
+            f'Sheet "{sheet_name}" not found in workbook. '
+            f'Available sheets: {", ".join(sheet_names)}'
+        )
+    
+    if (
+        sheet_names == [sheet_name]
+        and original_path.lower().endswith('.xlsx')
+        and not _xlsx_has_formulas(original_path)
+    ):
+        try:
+            os.link(original_path, processed_path)
+        except OSError:
+            shutil.copyfile(original_path, processed_path)
+        return
+    
+    workbook = load_workbook(original_path, data_only=True, keep_links=False)
+    keep_only_sheet(workbook, sheet_name)
+    workbook.save(processed_path)
+
 
 @shared_task(bind=True, max_retries=3)
 def process_spreadsheet_sheet(self, file_id: str):
     """
     Process a spreadsheet file by extracting the selected sheet.
     
+    Only values are copied unless the file record opts into preserve_styles;
+    the values-only path streams rows and never holds the full sheet.
+    
     Args:
         file_id: UUID of the ProcessedFile instance
     """
@@ -28,64 +131,33 @@ def process_spreadsheet_sheet(self, file_id: str):
         file_record.status = 'PROCESSING'
         file_record.save(update_fields=['status'])
         
-        original_path = file_record.original_file.path
-        workbook = load_workbook(original_path, read_only=False, data_only=True)
-        
-        if file_record.selected_sheet not in workbook.sheetnames:
-            raise ValueError(
-                f'Sheet "{file_record.selected_sheet}" not found in workbook. '
-                f'Available sheets: {", ".join(workbook.sheetnames)}'
-            )
-        
-        new_workbook = Workbook()
-        new_workbook.remove(new_workbook.active)  # Remove default sheet
-        
-        # Copy the selected sheet
-        source_sheet = workbook[file_record.selected_sheet]
-        new_sheet = new_workbook.create_sheet(title=file_record.selected_sheet)
-        
-        # Copy all cells from source to destination
-        for row in source_sheet.iter_rows():
-            for cell in row:
-                new_cell = new_sheet[cell.coordinate]
-                new_cell.value = cell.value
-                if cell.has_style:
-                    # Copy styles properly by creating new style objects
-                    if cell.font:
-                        new_cell.font = copy(cell.font)
-                    if cell.border:
-                        new_cell.border = copy(cell.border)
-                    if cell.fill:
-                        new_cell.fill = copy(cell.fill)
-                    if cell.number_format:
-                        new_cell.number_format = cell.number_format
-                    if cell.protection:
-                        new_cell.protection = copy(cell.protection)
-                    if cell.alignment:
-                        new_cell.alignment = copy(cell.alignment)
-        
-        # Save the processed workbook to a temporary location
+        # Write the workbook straight to its storage location and point the
+        # field at it, instead of saving a temp copy and re-reading it
         processed_filename = f'{file_id}_{file_record.selected_sheet}.xlsx'
-        processed_path = os.path.join(
-            settings.MEDIA_ROOT,
-            'temp',
-            'processed',
-            processed_filename
+        processed_name = file_record.processed_file.field.generate_filename(
+            file_record, processed_filename
         )
+        processed_path = file_record.processed_file.storage.path(processed_name)
         
         # Ensure directory exists
         os.makedirs(os.path.dirname(processed_path), exist_ok=True)
         
-        # Save workbook
-        new_workbook.save(processed_path)
-        
-        # Update the file record with processed file
-        with open(processed_path, 'rb') as f:
-            file_record.processed_file.save(
-                processed_filename,
-                ContentFile(f.read()),
-                save=False
-            )
+        # Write next to the target and swap it in: pipeline outputs may be hard
+        # links to the previous processed file, and must keep its old content
+        temp_path = f'{processed_path}.{uuid.uuid4().hex}.tmp'
+        original_path = file_record.original_file.path
+        try:
+            if file_record.preserve_styles:
+                _write_sheet_with_styles(original_path, file_record.selected_sheet, temp_path)
+            else:
+                _extract_sheet_values(original_path, file_record.selected_sheet).save(temp_path)
+            os.replace(temp_path, processed_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        
+        file_record.processed_file.name = processed_name
         
         # Mark as ready
         file_record.status = 'READY'
@@ -111,6 +183,22 @@ def process_spreadsheet_sheet(self, file_id: str):
         raise self.retry(exc=exc, countdown=60)
 
 
+def process_spreadsheet_bulk(file_ids):
+    """
+    Queue processing for several files as one Celery group.
+    
+    The messages are published together through a single producer instead
+    of one .delay() call per file.
+    
+    Args:
+        file_ids: Iterable of ProcessedFile UUIDs
+        
+    Returns:
+        GroupResult for the queued tasks
+    """
+    return group(process_spreadsheet_sheet.s(str(file_id)) for file_id in file_ids).apply_async()
+
+
 @shared_task
 def cleanup_expired_files():
     """
@@ -121,21 +209,24 @@ def cleanup_expired_files():
     from .services import delete_file_from_disk
     
     now = timezone.now()
-    expired_files = ProcessedFile.objects.filter(expires_at__lt=now)
+    # Snapshot the expired rows once: files expiring between two evaluations of
+    # the same queryset would lose their record but keep their files on disk.
+    expired_files = list(
+        ProcessedFile.objects.filter(expires_at__lt=now)
+        .values_list('pk', 'original_file', 'processed_file')
+    )
+    storage = ProcessedFile._meta.get_field('original_file').storage
     
-    deleted_count = 0
-    for file_record in expired_files:
-        # Delete original file
-        if file_record.original_file:
-            delete_file_from_disk(file_record.original_file.path)
-        
-        # Delete processed file
-        if file_record.processed_file:
-            delete_file_from_disk(file_record.processed_file.path)
-        
-        # Delete database record
-        file_record.delete()
-        deleted_count += 1
+    # Unlink files first, then remove exactly those records in one query
+    for _, original_name, processed_name in expired_files:
+        if original_name:
+            delete_file_from_disk(storage.path(original_name))
+        if processed_name:
+            delete_file_from_disk(storage.path(processed_name))
+    
+    pks = [pk for pk, _, _ in expired_files]
+    _, deleted_per_model = ProcessedFile.objects.filter(pk__in=pks).delete()
+    deleted_count = deleted_per_model.get(ProcessedFile._meta.label, 0)
     
     logger.info(f'Cleaned up {deleted_count} expired files')
     return deleted_count
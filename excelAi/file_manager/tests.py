@@ -0,0 +1,154 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .models import ProcessedFile
+
+USER_ID = 'user_1'
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def _file_record(clerk_user_id=USER_ID, **fields) -> ProcessedFile:
+    values = {
+        'selected_sheet': 'Data',
+        'status': 'READY',
+        'expires_at': timezone.now() + timedelta(hours=1),
+        'original_file': 'temp/originals/book.xlsx',
+    }
+    values.update(fields)
+    return ProcessedFile.objects.create(clerk_user_id=clerk_user_id, **values)
+
+
+class FileReprocessViewTests(TestCase):
+    url = '/api/files/reprocess'
+
+    def setUp(self):
+        self.client = APIClient(HTTP_X_CLERK_USER_ID=USER_ID)
+        patcher = mock.patch('file_manager.views.process_spreadsheet_bulk')
+        self.bulk = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _post(self, *file_records):
+        return self.client.post(
+            self.url,
+            {'file_ids': [str(file_record.file_id) for file_record in file_records]},
+            format='json',
+        )
+
+    def _queued_ids(self):
+        (file_ids,), _ = self.bulk.call_args
+        return [str(file_id) for file_id in file_ids]
+
+    def test_resets_and_queues_files(self):
+        ready = _file_record()
+        failed = _file_record(status='FAILED')
+
+        response = self._post(ready, failed)
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['file_ids'], [str(ready.file_id), str(failed.file_id)])
+        self.assertCountEqual(self._queued_ids(), [str(ready.file_id), str(failed.file_id)])
+        for file_record in (ready, failed):
+            file_record.refresh_from_db()
+            self.assertEqual(file_record.status, 'UPLOADED')
+
+    def test_duplicate_ids_are_queued_once(self):
+        ready = _file_record()
+
+        response = self._post(ready, ready)
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['file_ids'], [str(ready.file_id)])
+        self.assertEqual(self._queued_ids(), [str(ready.file_id)])
+
+    def test_processing_file_is_rejected(self):
+        ready = _file_record()
+        processing = _file_record(status='PROCESSING')
+
+        response = self._post(ready, processing)
+
+        self.assertEqual(response.status_code, 400)
+        self.bulk.assert_not_called()
+        ready.refresh_from_db()
+        processing.refresh_from_db()
+        self.assertEqual(ready.status, 'READY')
+        self.assertEqual(processing.status, 'PROCESSING')
+
+    def test_unavailable_files_are_not_found(self):
+        cases = {
+            'expired status': {'status': 'EXPIRED'},
+            'past expiry': {'expires_at': timezone.now() - timedelta(minutes=1)},
+            'sheet analysis upload': {'selected_sheet': ''},
+        }
+        for label, fields in cases.items():
+            with self.subTest(label):
+                ready = _file_record()
+                unavailable = _file_record(**fields)
+                status_before = unavailable.status
+
+                response = self._post(ready, unavailable)
+
+                self.assertEqual(response.status_code, 404)
+                self.bulk.assert_not_called()
+                ready.refresh_from_db()
+                unavailable.refresh_from_db()
+                self.assertEqual(ready.status, 'READY')
+                self.assertEqual(unavailable.status, status_before)
+
+    def test_other_users_file_is_not_found(self):
+        foreign = _file_record(clerk_user_id='user_2', status='FAILED')
+
+        response = self._post(foreign)
+
+        self.assertEqual(response.status_code, 404)
+        self.bulk.assert_not_called()
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.status, 'FAILED')
+
+    def test_invalid_ids_are_rejected(self):
+        response = self.client.post(self.url, {'file_ids': ['not-a-uuid']}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.bulk.assert_not_called()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class FileDownloadViewTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.client = APIClient(HTTP_X_CLERK_USER_ID=USER_ID)
+        self.file_record = _file_record()
+        self.file_record.processed_file.save('book_Data.xlsx', ContentFile(b'xlsx bytes'))
+        self.url = f'/api/files/download/{self.file_record.file_id}/'
+
+    def test_download_sends_validators(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'xlsx bytes')
+        self.assertTrue(response['ETag'].startswith(f'W/"{self.file_record.file_id}-'))
+        self.assertIn('Last-Modified', response)
+
+    def test_matching_if_none_match_is_not_modified(self):
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_stale_if_none_match_downloads_again(self):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH='W/"stale"')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'xlsx bytes')
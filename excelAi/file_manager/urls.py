@@ -2,12 +2,13 @@
 URL configuration for file_manager app.
 """
 from django.urls import path
-from .views import FileUploadView, FileStatusView, FileDownloadView
+from .views import FileUploadView, FileReprocessView, FileStatusView, FileDownloadView
 
 app_name = 'file_manager'
 
 urlpatterns = [
     path('upload', FileUploadView.as_view(), name='file_upload'),
+    path('reprocess', FileReprocessView.as_view(), name='file_reprocess'),
     path('status/<uuid:file_id>/', FileStatusView.as_view(), name='file_status'),
     path('download/<uuid:file_id>/', FileDownloadView.as_view(), name='file_download'),
 ]
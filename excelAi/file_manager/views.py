@@ -1,20 +1,27 @@
 """
 Views for file manager app.
 """
+import os
 from django.core.exceptions import PermissionDenied
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework import status
 from django.http import FileResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from .services import (
     check_authentication,
     validate_upload_request,
     handle_upload_file,
     get_file_by_id,
+    FILE_STATUS_FIELDS,
     format_file_status_response,
     format_upload_response,
     validate_file_for_download,
+    get_download_validators,
+    validate_reprocess_request,
+    get_files_for_reprocessing,
 )
 from .exceptions import (
     FileSizeExceededError,
@@ -24,7 +31,7 @@ from .exceptions import (
     AuthenticationError,
     RequestValidationError,
 )
-from .tasks import process_spreadsheet_sheet
+from .tasks import process_spreadsheet_sheet, process_spreadsheet_bulk
 
 
 class FileUploadView(APIView):
@@ -33,8 +40,9 @@ class FileUploadView(APIView):
     
     Expects:
     - POST request with multipart/form-data
-    - 'file' field: Excel file (.xlsx or .xls)
+    - 'file' field: Excel file (.xlsx, .xlsm or .xls)
     - 'sheet_name' field: Name of the sheet to extract
+    - 'preserve_styles' field (optional): Copy cell styles (default: values only)
     
     Returns:
     - file_id: UUID of the uploaded file
@@ -47,12 +55,13 @@ class FileUploadView(APIView):
         try:
             clerk_user_id = check_authentication(request)
             
-            uploaded_file, sheet_name = validate_upload_request(request)
+            uploaded_file, sheet_name, preserve_styles = validate_upload_request(request)
             
             file_record = handle_upload_file(
                 clerk_user_id=clerk_user_id,
                 uploaded_file=uploaded_file,
-                sheet_name=sheet_name
+                sheet_name=sheet_name,
+                preserve_styles=preserve_styles
             )
 
             
@@ -94,6 +103,58 @@ class FileUploadView(APIView):
             )
 
 
+class FileReprocessView(APIView):
+    """
+    API endpoint to re-run sheet extraction for several uploaded files.
+    
+    Expects:
+    - POST request with 'file_ids': list of file UUIDs owned by the user
+    
+    Returns:
+    - file_ids: UUIDs of the files queued for processing
+    - status: Current status of the files
+    """
+    
+    def post(self, request):
+        """Queue reprocessing for the given files."""
+        try:
+            clerk_user_id = check_authentication(request)
+            
+            file_ids = validate_reprocess_request(request)
+            files = get_files_for_reprocessing(file_ids, clerk_user_id)
+            
+            process_spreadsheet_bulk(file_record.file_id for file_record in files)
+            
+            return Response(
+                {'file_ids': file_ids, 'status': 'UPLOADED'},
+                status=status.HTTP_202_ACCEPTED
+            )
+        
+        except AuthenticationError as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+        
+        except RequestValidationError as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        except FileNotFoundError as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        except Exception as e:
+            return Response(
+                {'error': f'Error reprocessing files: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
 class FileStatusView(APIView):
     """
     API endpoint to check the status of a processed file.
@@ -115,7 +176,7 @@ class FileStatusView(APIView):
             clerk_user_id = check_authentication(request)
             
             # Get file record
-            file_record = get_file_by_id(file_id, clerk_user_id)
+            file_record = get_file_by_id(file_id, clerk_user_id, fields=FILE_STATUS_FIELDS)
             
             # Return formatted response
             return Response(
@@ -166,17 +227,33 @@ class FileDownloadView(APIView):
             clerk_user_id = check_authentication(request)
             
             # Get file record
-            file_record = get_file_by_id(file_id, clerk_user_id)
+            file_record = get_file_by_id(
+                file_id, clerk_user_id, fields=('status', 'processed_file')
+            )
             
             # Validate file is ready for download
             validate_file_for_download(file_record)
             
-            # Return file as download
+            # Answer conditional requests (If-None-Match / If-Modified-Since)
+            # with 304 before opening the file
+            etag, last_modified = get_download_validators(file_record)
+            not_modified = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if not_modified is not None:
+                return not_modified
+            
+            # Return file as download; FileResponse streams it in blocks (or via
+            # wsgi.file_wrapper/sendfile) and sets Content-Length from the file
             response = FileResponse(
                 file_record.processed_file.open('rb'),
-                content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+                content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+                as_attachment=True,
+                filename=os.path.basename(file_record.processed_file.name)
             )
-            response['Content-Disposition'] = f'attachment; filename="{file_record.processed_file.name}"'
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+            response['Cache-Control'] = 'private, no-cache'
             
             return response
         
@@ -0,0 +1,28 @@
+"""
+Workbook helpers shared by the file_manager tasks and the pipeline executor.
+"""
+from openpyxl import Workbook
+
+
+def keep_only_sheet(workbook: Workbook, sheet_name: str) -> None:
+    """
+    Reduce a loaded workbook to one sheet, in place.
+    
+    Other sheets are removed along with the workbook-level names pointing at
+    them. The kept sheet is made visible and active, since a workbook whose
+    only sheet is hidden cannot be saved.
+    
+    Args:
+        workbook: Workbook loaded with load_workbook (not read-only)
+        sheet_name: Name of the sheet to keep
+    """
+    for other in [name for name in workbook.sheetnames if name != sheet_name]:
+        workbook.remove(workbook[other])
+    
+    for name, defined_name in list(workbook.defined_names.items()):
+        if any(title != sheet_name for title, _ in defined_name.destinations):
+            del workbook.defined_names[name]
+    
+    sheet = workbook[sheet_name]
+    sheet.sheet_state = 'visible'
+    workbook.active = sheet
@@ -16,4 +16,5 @@ class PipelineJobAdmin(admin.ModelAdmin):
     )
     list_filter = ("status", "created_at")
     search_fields = ("job_id", "clerk_user_id", "celery_task_id")
-    readonly_fields = ("created_at", "updated_at", "started_at", "finished_at")
+    # Jobs are immutable once submitted; the task trusts the stored operations.
+    readonly_fields = ("pipeline_operations", "created_at", "updated_at", "started_at", "finished_at")
@@ -0,0 +1,51 @@
+"""
+Redis pub/sub channel per pipeline job.
+
+The worker publishes PROGRESS meta and status transitions; SSE streams block on the
+channel instead of polling the DB and the result backend.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from django_redis import get_redis_connection
+from redis.client import PubSub
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# Messages are JSON objects with "kind": "task_state" (state, meta) or "job_status" (status).
+TASK_STATE = "task_state"
+JOB_STATUS = "job_status"
+
+
+def job_channel(job_id: Any) -> str:
+    return f"pipeline:{job_id}"
+
+
+def publish_job_event(job_id: Any, *, kind: str, **data: Any) -> None:
+    """
+    Publish an event for job_id. Best effort: a lost message only delays the stream
+    until its next heartbeat re-check.
+    """
+    try:
+        get_redis_connection("default").publish(
+            job_channel(job_id), json.dumps({"kind": kind, **data}, default=str)
+        )
+    except RedisError:
+        logger.warning("Could not publish %s event for pipeline job %s", kind, job_id, exc_info=True)
+
+
+@contextmanager
+def job_event_subscription(job_id: Any) -> Iterator[PubSub]:
+    """Subscription to job_id's channel; the PubSub holds its own Redis connection."""
+    pubsub = get_redis_connection("default").pubsub(ignore_subscribe_messages=True)
+    try:
+        pubsub.subscribe(job_channel(job_id))
+        yield pubsub
+    finally:
+        pubsub.close()
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.1 on 2026-10-15 14:05
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('pipeline_execution', '0002_rename_pipeline_ex_clerk_u_a4f0c0_idx_pipeline_ex_clerk_u_8ac1fa_idx_and_more'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='pipelinejob',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['pipeline_operations'], name='pipeline_ops_gin', opclasses=['jsonb_path_ops']),
+        ),
+    ]
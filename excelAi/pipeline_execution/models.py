@@ -1,7 +1,10 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 import uuid
 from django.utils import timezone
 
+from .events import JOB_STATUS, publish_job_event
+
 
 class PipelineJob(models.Model):
     """
@@ -52,22 +55,34 @@ class PipelineJob(models.Model):
         indexes = [
             models.Index(fields=["clerk_user_id", "created_at"]),
             models.Index(fields=["status", "created_at"]),
+            # Containment (@>) queries on operations, e.g. jobs that used drop_column.
+            GinIndex(
+                fields=["pipeline_operations"],
+                opclasses=["jsonb_path_ops"],
+                name="pipeline_ops_gin",
+            ),
         ]
 
+    def _update(self, **values) -> None:
+        """
+        Persist the given fields (plus updated_at) with a single UPDATE, bypassing save().
+        """
+        values["updated_at"] = timezone.now()
+        PipelineJob.objects.filter(pk=self.pk).update(**values)
+        for field, value in values.items():
+            setattr(self, field, value)
+        if "status" in values:
+            publish_job_event(self.pk, kind=JOB_STATUS, status=self.status)
+
     def mark_running(self, task_id: str | None = None) -> None:
-        self.status = self.Status.RUNNING
-        self.started_at = timezone.now()
-        if task_id:
-            self.celery_task_id = task_id
-        self.save(update_fields=["status", "started_at", "celery_task_id", "updated_at"])
+        self._update(
+            status=self.Status.RUNNING,
+            started_at=timezone.now(),
+            celery_task_id=task_id or self.celery_task_id,
+        )
 
     def mark_succeeded(self) -> None:
-        self.status = self.Status.SUCCEEDED
-        self.finished_at = timezone.now()
-        self.save(update_fields=["status", "finished_at", "updated_at"])
+        self._update(status=self.Status.SUCCEEDED, finished_at=timezone.now())
 
     def mark_failed(self, error: str) -> None:
-        self.status = self.Status.FAILED
-        self.error = error
-        self.finished_at = timezone.now()
-        self.save(update_fields=["status", "error", "finished_at", "updated_at"])
+        self._update(status=self.Status.FAILED, error=error, finished_at=timezone.now())
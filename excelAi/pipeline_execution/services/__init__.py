@@ -6,7 +6,12 @@ Keep these functions pure (no DB, no request objects) so they are easy to unit t
 
 from .errors import PipelineValidationError
 from .validation import validate_pipeline_operations
-from .column_id import parse_column_id, resolve_column_id
+from .column_id import (
+    parse_column_id,
+    read_header_values,
+    resolve_column_id,
+    resolve_header_column_id,
+)
 from .operations import (
     apply_add_column,
     apply_drop_column,
@@ -23,7 +28,9 @@ __all__ = [
     "PipelineValidationError",
     "validate_pipeline_operations",
     "parse_column_id",
+    "read_header_values",
     "resolve_column_id",
+    "resolve_header_column_id",
     "apply_add_column",
     "apply_drop_column",
     "apply_filter_rows",
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Sequence
 
 from openpyxl.worksheet.worksheet import Worksheet
 
@@ -15,6 +16,11 @@ class ColumnId:
     column_name: str
 
 
+# Well-formed "<sheetName>:<columnOrder>:<columnName>"; anything else takes the
+# step-by-step checks below, which report what exactly is wrong.
+_COLUMN_ID_RE = re.compile(r"([^:]+):(\d+):([^:]+)")
+
+
 def parse_column_id(column_id: Any) -> ColumnId:
     """
     Parse "<sheetName>:<columnOrder>:<columnName>".
@@ -26,6 +32,13 @@ def parse_column_id(column_id: Any) -> ColumnId:
     if not isinstance(column_id, str):
         raise PipelineValidationError("columnId must be a string")
     raw = column_id.strip()
+
+    match = _COLUMN_ID_RE.fullmatch(raw)
+    if match:
+        return ColumnId(
+            sheet_name=match.group(1), column_order=int(match.group(2)), column_name=match.group(3)
+        )
+
     parts = raw.split(":")
     if len(parts) != 3:
         raise PipelineValidationError(
@@ -49,12 +62,20 @@ def parse_column_id(column_id: Any) -> ColumnId:
     return ColumnId(sheet_name=sheet_name, column_order=col_order, column_name=col_name)
 
 
+def read_header_values(ws: Worksheet, *, header_row_idx: int) -> list[Any]:
+    """Current values of the header row, for resolving several columnIds with one read."""
+    return list(
+        next(ws.iter_rows(min_row=header_row_idx, max_row=header_row_idx, values_only=True), ())
+    )
+
+
 def resolve_column_id(
     ws: Worksheet,
     *,
     selected_sheet: str,
     header_row_idx: int,
     column_id: str,
+    header: Sequence[Any] | None = None,
 ) -> int:
     """
     Resolve a columnId to a 1-based column index on the current worksheet state.
@@ -62,22 +83,44 @@ def resolve_column_id(
     Strict:
     - sheetName in columnId must match selected_sheet exactly
     - header row cell at (columnOrder + 1) must equal columnName exactly
+
+    `header` (from read_header_values) may be passed to avoid reading the header cell;
+    it must reflect the current worksheet state.
     """
-    parsed = parse_column_id(column_id)
+    if header is not None:
+        return resolve_header_column_id(header, selected_sheet=selected_sheet, column_id=column_id)
+
+    parsed = _parse_for_sheet(column_id, selected_sheet=selected_sheet)
+    excel_col = parsed.column_order + 1
+    _check_header_value(parsed, ws.cell(row=header_row_idx, column=excel_col).value)
+    return excel_col
 
+
+def resolve_header_column_id(header: Sequence[Any], *, selected_sheet: str, column_id: str) -> int:
+    """
+    Resolve a columnId to a 1-based column index against header values alone.
+
+    Same rules as resolve_column_id; used when the header is tracked without a worksheet.
+    """
+    parsed = _parse_for_sheet(column_id, selected_sheet=selected_sheet)
+    order = parsed.column_order
+    _check_header_value(parsed, header[order] if order < len(header) else None)
+    return order + 1
+
+
+def _parse_for_sheet(column_id: str, *, selected_sheet: str) -> ColumnId:
+    parsed = parse_column_id(column_id)
     if parsed.sheet_name != selected_sheet:
         raise PipelineValidationError(
             f"columnId sheetName '{parsed.sheet_name}' does not match selected sheet '{selected_sheet}'"
         )
+    return parsed
 
-    excel_col = parsed.column_order + 1
-    cell = ws.cell(row=header_row_idx, column=excel_col)
-    if cell.value != parsed.column_name:
+
+def _check_header_value(parsed: ColumnId, actual: Any) -> None:
+    if actual != parsed.column_name:
         raise PipelineValidationError(
             "columnId header mismatch. "
             f"Expected header[{parsed.column_order}] == '{parsed.column_name}', "
-            f"got '{cell.value}'"
+            f"got '{actual}'"
         )
-
-    return excel_col
-
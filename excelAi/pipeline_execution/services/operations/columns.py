@@ -1,21 +1,17 @@
 from __future__ import annotations
 
 from copy import copy
-from typing import Any
+from operator import itemgetter
+from typing import Any, Callable
 
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.worksheet import Worksheet
 
-from ..column_id import resolve_column_id
+from ..column_id import read_header_values, resolve_column_id, resolve_header_column_id
 from ..errors import PipelineValidationError
 from .common import _require_non_empty_str, _set_dim_attr_if_possible
 
 
-def _header_values(ws: Worksheet, *, header_row_idx: int) -> list[Any]:
-    # openpyxl returns tuples of cells via iter_rows; we want current values.
-    return [cell.value for cell in ws[header_row_idx]]
-
-
 def apply_rename_column(
     ws: Worksheet,
     *,
@@ -31,26 +27,28 @@ def apply_rename_column(
     - fail on name collision (new_name already exists in header row, excluding target column)
     - column_id must match selected_sheet and header (strict)
     """
-    if not isinstance(new_name, str) or not new_name.strip():
-        raise PipelineValidationError("newName must be a non-empty string")
-    new_name = new_name.strip()
+    new_name = _require_non_empty_str(new_name, field_name="newName")
 
+    header_vals = read_header_values(ws, header_row_idx=header_row_idx)
     col_idx = resolve_column_id(
         ws,
         selected_sheet=selected_sheet,
         header_row_idx=header_row_idx,
         column_id=column_id,
+        header=header_vals,
     )
+    _check_rename_collision(header_vals, col_idx=col_idx, new_name=new_name)
+
+    ws.cell(row=header_row_idx, column=col_idx).value = new_name
 
-    header_vals = _header_values(ws, header_row_idx=header_row_idx)
+
+def _check_rename_collision(header_vals: list[Any], *, col_idx: int, new_name: str) -> None:
     for i, val in enumerate(header_vals, start=1):
         if i == col_idx:
             continue
         if val == new_name:
             raise PipelineValidationError(f"Rename collision: header already contains '{new_name}'")
 
-    ws.cell(row=header_row_idx, column=col_idx).value = new_name
-
 
 def apply_drop_column(
     ws: Worksheet,
@@ -64,17 +62,11 @@ def apply_drop_column(
 
     - column_ids must be a non-empty list of unique strings
     - resolve all ids on current worksheet state before deletion
-    - delete from highest index to lowest to avoid shifting
+    - delete from highest index to lowest to avoid shifting, one call per contiguous run
     """
-    if not isinstance(column_ids, list):
-        raise PipelineValidationError("columnIds must be a list")
-    if not column_ids:
-        raise PipelineValidationError("columnIds must be a non-empty list")
-    if any(not isinstance(cid, str) or not cid.strip() for cid in column_ids):
-        raise PipelineValidationError("columnIds must contain non-empty strings only")
-    if len(set(column_ids)) != len(column_ids):
-        raise PipelineValidationError("columnIds must not contain duplicates")
+    _validate_drop_column_ids(column_ids)
 
+    header_vals = read_header_values(ws, header_row_idx=header_row_idx)
     resolved: list[int] = []
     for cid in column_ids:
         resolved.append(
@@ -83,11 +75,146 @@ def apply_drop_column(
                 selected_sheet=selected_sheet,
                 header_row_idx=header_row_idx,
                 column_id=cid,
+                header=header_vals,
             )
         )
 
-    for col_idx in sorted(set(resolved), reverse=True):
-        ws.delete_cols(col_idx, 1)
+    # Each delete_cols shifts every cell to its right, so delete contiguous runs
+    # in one call, right to left.
+    for start, count in reversed(_contiguous_runs(sorted(set(resolved)))):
+        ws.delete_cols(start, count)
+
+
+def _validate_drop_column_ids(column_ids: Any) -> None:
+    if not isinstance(column_ids, list):
+        raise PipelineValidationError("columnIds must be a list")
+    if not column_ids:
+        raise PipelineValidationError("columnIds must be a non-empty list")
+    if any(not isinstance(cid, str) or not cid.strip() for cid in column_ids):
+        raise PipelineValidationError("columnIds must contain non-empty strings only")
+    if len(set(column_ids)) != len(column_ids):
+        raise PipelineValidationError("columnIds must not contain duplicates")
+
+
+class ColumnProjection:
+    """
+    Net effect of rename_column/drop_column/reorder_columns ops, tracked on the header row alone.
+
+    Each method validates exactly like its apply_* counterpart, but instead of mutating
+    cells it updates `header` (final header values) and `source_indices` (0-based source
+    column of each surviving column), so the sheet is rewritten once after all ops
+    instead of once per op.
+    """
+
+    def __init__(self, header: list[Any]) -> None:
+        self.width = len(header)
+        self.source_header = list(header)
+        self.header = list(header)
+        self.source_indices = list(range(self.width))
+
+    def apply(self, operation_id: str, params: dict[str, Any], *, selected_sheet: str) -> None:
+        if operation_id == "rename_column":
+            self.rename_column(
+                selected_sheet=selected_sheet, column_id=params["columnId"], new_name=params["newName"]
+            )
+        elif operation_id == "drop_column":
+            self.drop_column(selected_sheet=selected_sheet, column_ids=params["columnIds"])
+        elif operation_id == "reorder_columns":
+            self.reorder_columns(selected_sheet=selected_sheet, column_ids=params["columnIds"])
+        else:
+            raise ValueError(f"Unsupported operationId for column projection: {operation_id}")
+
+    def rename_column(self, *, selected_sheet: str, column_id: str, new_name: Any) -> None:
+        new_name = _require_non_empty_str(new_name, field_name="newName")
+        col_idx = resolve_header_column_id(
+            self.header, selected_sheet=selected_sheet, column_id=column_id
+        )
+        _check_rename_collision(self.header, col_idx=col_idx, new_name=new_name)
+        self.header[col_idx - 1] = new_name
+
+    def drop_column(self, *, selected_sheet: str, column_ids: Any) -> None:
+        _validate_drop_column_ids(column_ids)
+        resolved = {
+            resolve_header_column_id(self.header, selected_sheet=selected_sheet, column_id=cid)
+            for cid in column_ids
+        }
+        for col_idx in sorted(resolved, reverse=True):
+            del self.header[col_idx - 1]
+            del self.source_indices[col_idx - 1]
+
+    def reorder_columns(self, *, selected_sheet: str, column_ids: Any) -> None:
+        resolved = _resolve_reorder_column_ids(
+            column_ids,
+            lambda cid: resolve_header_column_id(
+                self.header, selected_sheet=selected_sheet, column_id=cid
+            ),
+        )
+        header = list(self.header)
+        source_indices = list(self.source_indices)
+        for dest_col, src_col in zip(sorted(resolved), resolved):
+            self.header[dest_col - 1] = header[src_col - 1]
+            self.source_indices[dest_col - 1] = source_indices[src_col - 1]
+
+    def project(self, row: tuple[Any, ...]) -> list[Any]:
+        """Project a source row; cells right of the original header width are kept as is."""
+        size = len(row)
+        projected = [row[i] if i < size else None for i in self.source_indices]
+        projected.extend(row[self.width:])
+        return projected
+
+    def projector(self) -> Callable[[tuple[Any, ...]], list[Any]]:
+        """
+        Same as project, built once for the final state: rows spanning the header take a
+        single C-level itemgetter call instead of a per-cell Python loop.
+        """
+        indices = self.source_indices
+        width = self.width
+        if not indices:
+            return lambda row: list(row[width:])
+
+        if len(indices) == 1:
+            # itemgetter with a single index returns the item, not a tuple.
+            pick = itemgetter(slice(indices[0], indices[0] + 1))
+        else:
+            pick = itemgetter(*indices)
+
+        def project(row: tuple[Any, ...]) -> list[Any]:
+            if len(row) < width:
+                return self.project(row)
+            projected = list(pick(row))
+            projected.extend(row[width:])
+            return projected
+
+        return project
+
+    def apply_to_worksheet(self, ws: Worksheet, *, header_row_idx: int) -> None:
+        """
+        Apply the projection to ws in place (keeping styles): one delete_cols call per
+        contiguous run of dropped columns, then the changed header cells.
+
+        Only valid without reorders, i.e. while source_indices is still ascending.
+        """
+        if self.source_indices != sorted(self.source_indices):
+            raise ValueError("Reordered projections cannot be applied in place")
+
+        dropped = sorted(set(range(1, self.width + 1)) - {i + 1 for i in self.source_indices})
+        for start, count in reversed(_contiguous_runs(dropped)):
+            ws.delete_cols(start, count)
+
+        for col_idx, (src, value) in enumerate(zip(self.source_indices, self.header), start=1):
+            if value != self.source_header[src]:
+                ws.cell(row=header_row_idx, column=col_idx).value = value
+
+
+def _contiguous_runs(indices: list[int]) -> list[tuple[int, int]]:
+    """Group sorted indices into (start, count) runs of consecutive values."""
+    runs: list[tuple[int, int]] = []
+    for idx in indices:
+        if runs and runs[-1][0] + runs[-1][1] == idx:
+            runs[-1] = (runs[-1][0], runs[-1][1] + 1)
+        else:
+            runs.append((idx, 1))
+    return runs
 
 
 def _parse_constant_source(source: Any) -> Any:
@@ -122,7 +249,7 @@ def apply_add_column(
     column_name = _require_non_empty_str(column_name, field_name="columnName")
     fill_value = _parse_constant_source(source)
 
-    header_vals = _header_values(ws, header_row_idx=header_row_idx)
+    header_vals = read_header_values(ws, header_row_idx=header_row_idx)
     if column_name in header_vals:
         raise PipelineValidationError(f"Add column collision: header already contains '{column_name}'")
 
@@ -202,6 +329,22 @@ def _copy_column_dimensions(ws: Worksheet, *, from_col: int, to_col: int) -> Non
             _set_dim_attr_if_possible(dim_to, attr, getattr(dim_from, attr))
 
 
+def _resolve_reorder_column_ids(column_ids: Any, resolve: Callable[[str], int]) -> list[int]:
+    if not isinstance(column_ids, list):
+        raise PipelineValidationError("columnIds must be a list")
+    if len(column_ids) < 2:
+        raise PipelineValidationError("columnIds must contain at least two items")
+    if any(not isinstance(cid, str) or not cid.strip() for cid in column_ids):
+        raise PipelineValidationError("columnIds must contain non-empty strings only")
+    if len(set(column_ids)) != len(column_ids):
+        raise PipelineValidationError("columnIds must not contain duplicates")
+
+    resolved = [resolve(cid) for cid in column_ids]
+    if len(set(resolved)) != len(resolved):
+        raise PipelineValidationError("columnIds must refer to distinct columns")
+    return resolved
+
+
 def apply_reorder_columns(
     ws: Worksheet,
     *,
@@ -216,26 +359,17 @@ def apply_reorder_columns(
     - both columnIds must resolve against the current worksheet state
     - columns listed are reordered to match the given order while keeping all other columns in place
     """
-    if not isinstance(column_ids, list):
-        raise PipelineValidationError("columnIds must be a list")
-    if len(column_ids) < 2:
-        raise PipelineValidationError("columnIds must contain at least two items")
-    if any(not isinstance(cid, str) or not cid.strip() for cid in column_ids):
-        raise PipelineValidationError("columnIds must contain non-empty strings only")
-    if len(set(column_ids)) != len(column_ids):
-        raise PipelineValidationError("columnIds must not contain duplicates")
-
-    resolved: list[int] = [
-        resolve_column_id(
+    header_vals = read_header_values(ws, header_row_idx=header_row_idx)
+    resolved = _resolve_reorder_column_ids(
+        column_ids,
+        lambda cid: resolve_column_id(
             ws,
             selected_sheet=selected_sheet,
             header_row_idx=header_row_idx,
             column_id=cid,
-        )
-        for cid in column_ids
-    ]
-    if len(set(resolved)) != len(resolved):
-        raise PipelineValidationError("columnIds must refer to distinct columns")
+            header=header_vals,
+        ),
+    )
 
     # We reorder within the set of positions currently occupied by these columns,
     # leaving other columns untouched.
@@ -54,6 +54,9 @@ def _filter_non_empty_values(values: list[Any]) -> list[Any]:
 
 
 def _is_numeric_value(value: Any) -> bool:
+    if isinstance(value, bool):
+        # bool is a subclass of int; a mostly-boolean column is not numeric
+        return False
     if isinstance(value, (int, float)):
         return True
 
@@ -145,7 +148,10 @@ def _determine_column_type(values: list[Any]) -> Optional[str]:
 
 
 def _is_empty_row(row: tuple[Any, ...]) -> bool:
-    return all(cell is None or cell == "" for cell in row)
+    for cell in row:
+        if cell is not None and cell != "":
+            return False
+    return True
 
 
 def _collect_column_values(ws: Worksheet, *, header_row_idx: int, col_idx: int) -> list[Any]:
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Optional
 
 from openpyxl.worksheet.worksheet import Worksheet
 
-from ..column_id import resolve_column_id
+from ..column_id import read_header_values, resolve_column_id
 from ..errors import PipelineValidationError
 from .common import (
     _collect_column_values,
@@ -41,12 +41,14 @@ def _require_date_dtype_and_resolve(
     header_row_idx: int,
     selected_sheet: str,
     column_id: str,
+    header: Optional[list[Any]] = None,
 ) -> int:
     col_idx = resolve_column_id(
         ws,
         selected_sheet=selected_sheet,
         header_row_idx=header_row_idx,
         column_id=column_id,
+        header=header,
     )
 
     values = _collect_column_values(ws, header_row_idx=header_row_idx, col_idx=col_idx)
@@ -94,6 +96,8 @@ def apply_parse_date(
         )
     excel_number_format = _DATE_OUTPUT_FORMAT_TO_EXCEL_NUMBER_FORMAT[output_format_str]
 
+    # Only data rows are modified, so one header read serves all columns.
+    header_vals = read_header_values(ws, header_row_idx=header_row_idx)
     for column_id in column_ids:
         column_id = column_id.strip()
         col_idx = _require_date_dtype_and_resolve(
@@ -101,6 +105,7 @@ def apply_parse_date(
             header_row_idx=header_row_idx,
             selected_sheet=selected_sheet,
             column_id=column_id,
+            header=header_vals,
         )
 
         for row_idx in range(header_row_idx + 1, ws.max_row + 1):
@@ -4,7 +4,7 @@ from typing import Any, Optional
 
 from openpyxl.worksheet.worksheet import Worksheet
 
-from ..column_id import resolve_column_id
+from ..column_id import read_header_values, resolve_column_id
 from ..errors import PipelineValidationError
 from .common import (
     _infer_column_type_cached,
@@ -69,6 +69,7 @@ def apply_filter_rows(
         raise PipelineValidationError("rules must be a non-empty list")
 
     col_type_cache: dict[int, Optional[str]] = {}
+    header_vals = read_header_values(ws, header_row_idx=header_row_idx)
 
     compiled_rules: list[dict[str, Any]] = []
     for rule_idx, raw_rule in enumerate(rules_list):
@@ -128,6 +129,7 @@ def apply_filter_rows(
                 selected_sheet=selected_sheet,
                 header_row_idx=header_row_idx,
                 column_id=column_id,
+                header=header_vals,
             )
 
             operator_raw = cond.get("operator")
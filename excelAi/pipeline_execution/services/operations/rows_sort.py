@@ -6,7 +6,7 @@ from typing import Any, Optional
 
 from openpyxl.worksheet.worksheet import Worksheet
 
-from ..column_id import resolve_column_id
+from ..column_id import read_header_values, resolve_column_id
 from ..errors import PipelineValidationError
 from .common import (
     _infer_column_type_cached,
@@ -205,6 +205,7 @@ def apply_sort_rows(
     max_row, max_col = dims
 
     col_type_cache: dict[int, Optional[str]] = {}
+    header_vals = read_header_values(ws, header_row_idx=header_row_idx)
 
     compiled: list[dict[str, Any]] = []
     for i, s in enumerate(parsed_sorts):
@@ -215,6 +216,7 @@ def apply_sort_rows(
             selected_sheet=selected_sheet,
             header_row_idx=header_row_idx,
             column_id=column_id,
+            header=header_vals,
         )
         inferred = _infer_column_type_cached(
             ws, header_row_idx=header_row_idx, col_idx=col_idx, cache=col_type_cache
@@ -4,7 +4,7 @@ from typing import Any, Optional
 
 from openpyxl.worksheet.worksheet import Worksheet
 
-from ..column_id import resolve_column_id
+from ..column_id import read_header_values, resolve_column_id
 from ..errors import PipelineValidationError
 from .common import _collect_column_values, _determine_column_type
 
@@ -15,12 +15,14 @@ def _require_text_dtype_and_resolve(
     header_row_idx: int,
     selected_sheet: str,
     column_id: str,
+    header: Optional[list[Any]] = None,
 ) -> int:
     col_idx = resolve_column_id(
         ws,
         selected_sheet=selected_sheet,
         header_row_idx=header_row_idx,
         column_id=column_id,
+        header=header,
     )
     inferred = _determine_column_type(_collect_column_values(ws, header_row_idx=header_row_idx, col_idx=col_idx))
     if inferred != "string":
@@ -97,6 +99,8 @@ def apply_normalize_case(
 ) -> None:
     parsed_targets = _parse_normalize_targets(targets)
 
+    # Only data rows are modified, so one header read serves all targets.
+    header_vals = read_header_values(ws, header_row_idx=header_row_idx)
     for target in parsed_targets:
         column_id = target["columnId"]
         text_case = target["textCase"]
@@ -106,6 +110,7 @@ def apply_normalize_case(
             header_row_idx=header_row_idx,
             selected_sheet=selected_sheet,
             column_id=column_id,
+            header=header_vals,
         )
 
         for row_idx in range(header_row_idx + 1, ws.max_row + 1):
@@ -1,47 +1,86 @@
 from __future__ import annotations
 
-from copy import copy
-
 from openpyxl import Workbook, load_workbook
+from openpyxl.worksheet._read_only import ReadOnlyWorksheet
 
+from file_manager.workbook import keep_only_sheet
 
-def extract_selected_sheet_workbook(*, original_path: str, selected_sheet: str) -> Workbook:
-    """
-    Load workbook from original_path and return a NEW workbook containing only selected_sheet.
+from .operations import ColumnProjection
 
-    Copies values + basic styles similarly to `file_manager.tasks.process_spreadsheet_sheet`.
-    """
-    wb = load_workbook(original_path, read_only=False, data_only=True)
 
+def _check_sheet_exists(wb: Workbook, selected_sheet: str) -> None:
     if selected_sheet not in wb.sheetnames:
         raise ValueError(
             f'Sheet "{selected_sheet}" not found in workbook. '
             f'Available sheets: {", ".join(wb.sheetnames)}'
         )
 
-    new_wb = Workbook()
-    new_wb.remove(new_wb.active)  # remove default sheet
-
-    source = wb[selected_sheet]
-    target = new_wb.create_sheet(title=selected_sheet)
-
-    for row in source.iter_rows():
-        for cell in row:
-            new_cell = target[cell.coordinate]
-            new_cell.value = cell.value
-            if cell.has_style:
-                if cell.font:
-                    new_cell.font = copy(cell.font)
-                if cell.border:
-                    new_cell.border = copy(cell.border)
-                if cell.fill:
-                    new_cell.fill = copy(cell.fill)
-                if cell.number_format:
-                    new_cell.number_format = cell.number_format
-                if cell.protection:
-                    new_cell.protection = copy(cell.protection)
-                if cell.alignment:
-                    new_cell.alignment = copy(cell.alignment)
-
-    return new_wb
 
+def open_selected_sheet_read_only(*, original_path: str, selected_sheet: str) -> Workbook:
+    """
+    Open original_path in read-only, values-only mode, checking that selected_sheet exists.
+
+    The caller must close() the returned workbook.
+    """
+    wb = load_workbook(original_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        _check_sheet_exists(wb, selected_sheet)
+    except Exception:
+        wb.close()
+        raise
+    return wb
+
+
+def save_projected_sheet(
+    ws: ReadOnlyWorksheet,
+    *,
+    projection: ColumnProjection,
+    header_row_idx: int,
+    output_path: str,
+) -> None:
+    """
+    Stream ws row by row through projection into a write-only workbook saved at output_path.
+
+    Memory stays flat regardless of sheet size: neither side keeps the cells around.
+    """
+    out = Workbook(write_only=True)
+    target = out.create_sheet(ws.title)
+    project = projection.projector()
+    for row_idx, row in enumerate(ws.iter_rows(values_only=True), start=1):
+        if row_idx == header_row_idx:
+            target.append(projection.header)
+        else:
+            target.append(project(row))
+    out.save(output_path)
+
+
+def extract_selected_sheet_workbook(
+    *, original_path: str, selected_sheet: str, preserve_styles: bool = False
+) -> Workbook:
+    """
+    Load workbook from original_path and return a NEW workbook containing only selected_sheet.
+
+    By default only values are copied, streaming rows from a read-only source. With
+    preserve_styles, the full workbook is loaded and every other sheet is removed.
+    The result is a regular (editable) workbook, since operations mutate it in place.
+    """
+    if not preserve_styles:
+        wb = open_selected_sheet_read_only(original_path=original_path, selected_sheet=selected_sheet)
+        try:
+            new_wb = Workbook()
+            target = new_wb.active
+            target.title = selected_sheet
+            for row in wb[selected_sheet].iter_rows(values_only=True):
+                target.append(row)
+        finally:
+            wb.close()
+
+        return new_wb
+
+    # Keep styles by dropping the other sheets from the loaded workbook instead
+    # of copying the selected one cell by cell.
+    wb = load_workbook(original_path, data_only=True, keep_links=False)
+    _check_sheet_exists(wb, selected_sheet)
+
+    keep_only_sheet(wb, selected_sheet)
+    return wb
@@ -1,16 +1,17 @@
 from __future__ import annotations
 
-import io
 import os
+import shutil
 from pathlib import Path
 
 from celery import shared_task
-from django.core.files.base import ContentFile
 from django.utils import timezone
 
+from .events import TASK_STATE, publish_job_event
 from .models import PipelineJob
-from .services.validation import validate_pipeline_operations
+from .services.column_id import read_header_values
 from .services.operations import (
+    ColumnProjection,
     apply_add_column,
     apply_drop_column,
     apply_filter_rows,
@@ -21,7 +22,70 @@ from .services.operations import (
     apply_reorder_columns,
     apply_sort_rows,
 )
-from .services.workbook import extract_selected_sheet_workbook
+from .services.workbook import (
+    extract_selected_sheet_workbook,
+    open_selected_sheet_read_only,
+    save_projected_sheet,
+)
+
+# Operations ColumnProjection can compile into a single rewrite of the sheet.
+PROJECTION_OPERATION_IDS = frozenset({"rename_column", "drop_column", "reorder_columns"})
+# Subset that can be applied in place on a styled sheet (reorders also move cell styles).
+IN_PLACE_PROJECTION_OPERATION_IDS = frozenset({"rename_column", "drop_column"})
+
+PROGRESS_REPORT_LIMIT = 50
+
+
+def _reserve_output_path(job: PipelineJob, file_record) -> tuple[str, str]:
+    """Pick a free storage name for the job's output; returns (name, local path)."""
+    original_name = os.path.basename(file_record.original_file.name)
+    base = Path(original_name).stem or str(file_record.file_id)
+    timestamp = timezone.now().strftime("%Y%m%d_%H%M%S")
+    output_filename = f"{base}_{timestamp}.xlsx"
+
+    storage = job.output_file.storage
+    output_name = storage.get_available_name(
+        job.output_file.field.generate_filename(job, output_filename)
+    )
+    output_path = storage.path(output_name)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    return output_name, output_path
+
+
+def link_processed_output(job: PipelineJob, file_record) -> None:
+    """
+    Use the file's processed (values-only) sheet as the output of a job without
+    operations: it is exactly what execute_pipeline would write. Sets
+    job.output_file without saving the job.
+
+    Hard linking is safe because reprocessing never writes into the processed
+    file: it replaces it with a new one (os.replace), so the link keeps the old content.
+    """
+    output_name, output_path = _reserve_output_path(job, file_record)
+    try:
+        os.link(file_record.processed_file.path, output_path)
+    except OSError:
+        shutil.copyfile(file_record.processed_file.path, output_path)
+    job.output_file.name = output_name
+
+
+def _report_progress(task, job_id, *, index: int, total: int, op: dict) -> None:
+    """
+    Store PROGRESS meta for op number `index` (done) on the task, then push it to the
+    job's stream subscribers.
+
+    "rev" increases with every report, so consumers can detect a change by comparing
+    one integer.
+    """
+    meta = {
+        "index": index,
+        "total": total,
+        "op": {"id": op["id"], "operationId": op["operationId"]},
+        "phase": "done",
+        "rev": index,
+    }
+    task.update_state(state="PROGRESS", meta=meta)
+    publish_job_event(job_id, kind=TASK_STATE, state="PROGRESS", meta=meta)
 
 
 @shared_task(bind=True)
@@ -33,6 +97,8 @@ def execute_pipeline(self, job_id: str):
     applies operations sequentially in-memory, and only writes output_file if the full pipeline succeeds.
     """
     job: PipelineJob | None = None
+    source_wb = None
+    projection: ColumnProjection | None = None
     try:
         job = PipelineJob.objects.select_related("file").get(job_id=job_id)
         file_record = job.file
@@ -41,32 +107,44 @@ def execute_pipeline(self, job_id: str):
         task_id = getattr(self.request, "id", None) or job.celery_task_id
         job.mark_running(task_id=task_id)
 
-        ops = validate_pipeline_operations(job.pipeline_operations)
-
-        wb = extract_selected_sheet_workbook(
-            original_path=file_record.original_file.path,
-            selected_sheet=file_record.selected_sheet,
-        )
-        ws = wb[file_record.selected_sheet]
+        # Stored as returned by validate_pipeline_operations at submit time (and
+        # read-only afterwards), so it is not validated again here.
+        ops = job.pipeline_operations
 
         header_row_idx = 1
         total = len(ops)
-
-        for i, op in enumerate(ops):
-            self.update_state(
-                state="PROGRESS",
-                meta={
-                    "index": i + 1,
-                    "total": total,
-                    "op": {"id": op["id"], "operationId": op["operationId"]},
-                    "phase": "start",
-                },
+        # At most PROGRESS_REPORT_LIMIT reports (result backend write + publish) per
+        # pipeline: every `report_every`-th op, and always the last one.
+        report_every = max(1, -(-total // PROGRESS_REPORT_LIMIT))
+
+        # Pipelines made of column ops only are compiled on the header row and applied
+        # once: values-only files stream read-only rows into a write-only workbook,
+        # styled files get one delete_cols per contiguous run plus the header cells.
+        operation_ids = {op["operationId"] for op in ops}
+        if not file_record.preserve_styles and operation_ids <= PROJECTION_OPERATION_IDS:
+            source_wb = open_selected_sheet_read_only(
+                original_path=file_record.original_file.path,
+                selected_sheet=file_record.selected_sheet,
+            )
+            ws = source_wb[file_record.selected_sheet]
+            projection = ColumnProjection(read_header_values(ws, header_row_idx=header_row_idx))
+        else:
+            wb = extract_selected_sheet_workbook(
+                original_path=file_record.original_file.path,
+                selected_sheet=file_record.selected_sheet,
+                preserve_styles=file_record.preserve_styles,
             )
+            ws = wb[file_record.selected_sheet]
+            if operation_ids <= IN_PLACE_PROJECTION_OPERATION_IDS:
+                projection = ColumnProjection(read_header_values(ws, header_row_idx=header_row_idx))
 
+        for i, op in enumerate(ops):
             operation_id = op["operationId"]
             params = op["params"]
 
-            if operation_id == "rename_column":
+            if projection is not None:
+                projection.apply(operation_id, params, selected_sheet=file_record.selected_sheet)
+            elif operation_id == "rename_column":
                 apply_rename_column(
                     ws,
                     header_row_idx=header_row_idx,
@@ -138,27 +216,23 @@ def execute_pipeline(self, job_id: str):
                 # Should be unreachable due to strict validation
                 raise ValueError(f"Unsupported operationId: {operation_id}")
 
-            self.update_state(
-                state="PROGRESS",
-                meta={
-                    "index": i + 1,
-                    "total": total,
-                    "op": {"id": op["id"], "operationId": op["operationId"]},
-                    "phase": "done",
-                },
-            )
+            if (i + 1) % report_every == 0 or i + 1 == total:
+                _report_progress(self, job.job_id, index=i + 1, total=total, op=op)
 
-        # Save output only after all ops succeed.
-        buf = io.BytesIO()
-        wb.save(buf)
-        buf.seek(0)
+        if projection is not None and source_wb is None:
+            projection.apply_to_worksheet(ws, header_row_idx=header_row_idx)
 
-        original_name = os.path.basename(file_record.original_file.name)
-        base = Path(original_name).stem or str(file_record.file_id)
-        timestamp = timezone.now().strftime("%Y%m%d_%H%M%S")
-        output_filename = f"{base}_{timestamp}.xlsx"
+        # Save output only after all ops succeed, serializing straight to the
+        # storage location (no in-memory copy of the xlsx).
+        output_name, output_path = _reserve_output_path(job, file_record)
+        if source_wb is not None:
+            save_projected_sheet(
+                ws, projection=projection, header_row_idx=header_row_idx, output_path=output_path
+            )
+        else:
+            wb.save(output_path)
 
-        job.output_file.save(output_filename, ContentFile(buf.read()), save=False)
+        job.output_file.name = output_name
         job.error = None
         job.save(update_fields=["output_file", "error", "updated_at"])
         job.mark_succeeded()
@@ -170,3 +244,6 @@ def execute_pipeline(self, job_id: str):
             job.mark_failed(str(exc))
         raise
 
+    finally:
+        if source_wb is not None:
+            source_wb.close()
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from openpyxl import Workbook
+from openpyxl.styles import Font
+from rest_framework.test import APIClient
+
+from file_manager.models import ProcessedFile
+
+from .models import PipelineJob
+from .services import (
+    apply_drop_column,
+    apply_rename_column,
+    apply_reorder_columns,
+    read_header_values,
+)
+from .services.errors import PipelineValidationError
+from .services.operations import ColumnProjection
+
+SHEET = "S"
+HEADER = ["a", "b", "c", "d", "e"]
+ROWS = [
+    ["x0", 0, None, "2020", 0, "extra"],
+    ["x1", 1, "h"],
+    [None, None, None, None, None],
+    ["x3", 3, "h", "2021", 1],
+    ["x4"],
+]
+
+APPLY = {
+    "rename_column": lambda ws, p: apply_rename_column(
+        ws, header_row_idx=1, selected_sheet=SHEET, column_id=p["columnId"], new_name=p["newName"]
+    ),
+    "drop_column": lambda ws, p: apply_drop_column(
+        ws, header_row_idx=1, selected_sheet=SHEET, column_ids=p["columnIds"]
+    ),
+    "reorder_columns": lambda ws, p: apply_reorder_columns(
+        ws, header_row_idx=1, selected_sheet=SHEET, column_ids=p["columnIds"]
+    ),
+}
+
+
+def _cid(idx: int, name: str) -> str:
+    return f"{SHEET}:{idx}:{name}"
+
+
+# Sequences without reorders, valid for both projector() and apply_to_worksheet().
+IN_PLACE_PIPELINES: list[list[tuple[str, dict[str, Any]]]] = [
+    [],
+    [("rename_column", {"columnId": _cid(1, "b"), "newName": "B"})],
+    [("drop_column", {"columnIds": [_cid(1, "b"), _cid(2, "c"), _cid(4, "e")]})],
+    [
+        ("rename_column", {"columnId": _cid(0, "a"), "newName": "first"}),
+        ("drop_column", {"columnIds": [_cid(1, "b")]}),
+        ("rename_column", {"columnId": _cid(1, "c"), "newName": "b"}),
+        ("drop_column", {"columnIds": [_cid(0, "first"), _cid(3, "e")]}),
+    ],
+    [("drop_column", {"columnIds": [_cid(i, name) for i, name in enumerate(HEADER)]})],
+]
+
+REORDER_PIPELINES: list[list[tuple[str, dict[str, Any]]]] = [
+    [("reorder_columns", {"columnIds": [_cid(3, "d"), _cid(0, "a")]})],
+    [
+        ("drop_column", {"columnIds": [_cid(2, "c")]}),
+        ("reorder_columns", {"columnIds": [_cid(3, "e"), _cid(1, "b"), _cid(0, "a")]}),
+        ("rename_column", {"columnId": _cid(0, "e"), "newName": "a2"}),
+    ],
+    [
+        ("reorder_columns", {"columnIds": [_cid(4, "e"), _cid(0, "a")]}),
+        ("drop_column", {"columnIds": [_cid(0, "e")]}),
+    ],
+]
+
+INVALID_PIPELINES: list[list[tuple[str, dict[str, Any]]]] = [
+    [("rename_column", {"columnId": _cid(1, "b"), "newName": "a"})],
+    [("rename_column", {"columnId": _cid(9, "q"), "newName": "n"})],
+    [
+        ("drop_column", {"columnIds": [_cid(0, "a")]}),
+        ("rename_column", {"columnId": _cid(0, "a"), "newName": "n"}),
+    ],
+    [("drop_column", {"columnIds": []})],
+    [("reorder_columns", {"columnIds": [_cid(0, "a")]})],
+]
+
+
+def _build_sheet() -> Workbook:
+    wb = Workbook()
+    ws = wb.active
+    ws.title = SHEET
+    ws.append(HEADER)
+    for row in ROWS:
+        ws.append(row)
+    for col_idx in range(1, len(HEADER) + 1):
+        ws.cell(row=2, column=col_idx).font = Font(bold=col_idx % 2 == 0)
+    return wb
+
+
+def _values(ws) -> list[list[Any]]:
+    """Sheet values with trailing empty cells and rows trimmed."""
+    rows = []
+    for row in ws.iter_rows(values_only=True):
+        row = list(row)
+        while row and row[-1] is None:
+            row.pop()
+        rows.append(row)
+    while rows and not rows[-1]:
+        rows.pop()
+    return rows
+
+
+def _bold(ws) -> list[Any]:
+    return [ws.cell(row=2, column=col_idx).font.b for col_idx in range(1, len(HEADER) + 2)]
+
+
+def _apply_per_op(ops: list[tuple[str, dict[str, Any]]]):
+    ws = _build_sheet()[SHEET]
+    for operation_id, params in ops:
+        APPLY[operation_id](ws, params)
+    return ws
+
+
+def _projection(ws, ops: list[tuple[str, dict[str, Any]]]) -> ColumnProjection:
+    projection = ColumnProjection(read_header_values(ws, header_row_idx=1))
+    for operation_id, params in ops:
+        projection.apply(operation_id, params, selected_sheet=SHEET)
+    return projection
+
+
+class ColumnProjectionTests(SimpleTestCase):
+    """ColumnProjection must produce what the per-op apply_* functions produce."""
+
+    def test_projector_matches_per_op_path(self):
+        for ops in IN_PLACE_PIPELINES + REORDER_PIPELINES:
+            with self.subTest(ops=ops):
+                source = _build_sheet()[SHEET]
+                projection = _projection(source, ops)
+                project = projection.projector()
+
+                out = Workbook().active
+                for row_idx, row in enumerate(source.iter_rows(values_only=True), start=1):
+                    out.append(projection.header if row_idx == 1 else project(row))
+
+                self.assertEqual(_values(out), _values(_apply_per_op(ops)))
+
+    def test_projector_matches_project_on_ragged_rows(self):
+        for ops in IN_PLACE_PIPELINES + REORDER_PIPELINES:
+            with self.subTest(ops=ops):
+                projection = _projection(_build_sheet()[SHEET], ops)
+                project = projection.projector()
+                for row in ROWS:
+                    self.assertEqual(project(tuple(row)), projection.project(tuple(row)))
+
+    def test_apply_to_worksheet_matches_per_op_path(self):
+        for ops in IN_PLACE_PIPELINES:
+            with self.subTest(ops=ops):
+                ws = _build_sheet()[SHEET]
+                _projection(ws, ops).apply_to_worksheet(ws, header_row_idx=1)
+
+                expected = _apply_per_op(ops)
+                self.assertEqual(_values(ws), _values(expected))
+                self.assertEqual(_bold(ws), _bold(expected))
+
+    def test_apply_to_worksheet_rejects_reorders(self):
+        ws = _build_sheet()[SHEET]
+        projection = _projection(ws, REORDER_PIPELINES[0])
+        with self.assertRaises(ValueError):
+            projection.apply_to_worksheet(ws, header_row_idx=1)
+
+    def test_validation_errors_match_per_op_path(self):
+        for ops in INVALID_PIPELINES:
+            with self.subTest(ops=ops):
+                with self.assertRaises(PipelineValidationError) as per_op:
+                    _apply_per_op(ops)
+                with self.assertRaises(PipelineValidationError) as projected:
+                    _projection(_build_sheet()[SHEET], ops)
+                self.assertEqual(str(projected.exception), str(per_op.exception))
+
+
+class PipelineExecuteViewTests(TestCase):
+    def test_rejects_sheet_analysis_upload(self):
+        # Analysis uploads are READY but have no selected sheet to run a pipeline on.
+        file_record = ProcessedFile.objects.create(
+            clerk_user_id="user_1",
+            original_file="temp/originals/book.xlsx",
+            selected_sheet="",
+            status="READY",
+            expires_at=timezone.now() + timedelta(hours=1),
+        )
+        client = APIClient(HTTP_X_CLERK_USER_ID="user_1")
+
+        with mock.patch("pipeline_execution.views.execute.execute_pipeline") as task:
+            response = client.post(
+                "/api/pipeline/execution/",
+                {"file_id": str(file_record.file_id), "pipeline_operations": []},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, 404)
+        task.apply_async.assert_not_called()
+        self.assertFalse(PipelineJob.objects.exists())
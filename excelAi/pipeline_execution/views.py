@@ -1,6 +0,0 @@
-from .views import (
-    PipelineDownloadView,
-    PipelineExecuteView,
-    PipelineStatusView,
-    pipeline_stream,
-)
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
 import os
+from urllib.parse import quote
 
-from django.http import FileResponse
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -12,6 +16,8 @@ from file_manager.services import check_authentication
 
 from ..models import PipelineJob
 
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
 
 class PipelineDownloadView(APIView):
     """
@@ -21,7 +27,9 @@ class PipelineDownloadView(APIView):
     def get(self, request, job_id):
         try:
             clerk_user_id = check_authentication(request)
-            job = PipelineJob.objects.select_related("file").get(job_id=job_id)
+            job = PipelineJob.objects.only(
+                "clerk_user_id", "status", "output_file", "finished_at"
+            ).get(job_id=job_id)
             if job.clerk_user_id != clerk_user_id:
                 raise FileNotFoundError("Job not found")
 
@@ -31,12 +39,38 @@ class PipelineDownloadView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            filename = os.path.basename(job.output_file.name)
-            resp = FileResponse(
-                job.output_file.open("rb"),
-                content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            # A job's output is written once, so the job id is a strong enough validator;
+            # answer If-None-Match / If-Modified-Since with 304 before touching the file.
+            etag = f'W/"{job.job_id}"'
+            last_modified = int(job.finished_at.timestamp()) if job.finished_at else None
+            not_modified = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
             )
-            resp["Content-Disposition"] = f'attachment; filename="{filename}"'
+            if not_modified is not None:
+                return not_modified
+
+            filename = os.path.basename(job.output_file.name)
+            accel_prefix = settings.PIPELINE_DOWNLOAD_ACCEL_PREFIX
+            if accel_prefix:
+                # nginx sends the file itself (Content-Length, ranges); Django only
+                # authorizes the download.
+                resp = HttpResponse(content_type=XLSX_CONTENT_TYPE)
+                resp["X-Accel-Redirect"] = f"{accel_prefix.rstrip('/')}/{quote(job.output_file.name)}"
+                resp["Content-Disposition"] = content_disposition_header(True, filename)
+            else:
+                # A plain file object lets FileResponse hand it to wsgi.file_wrapper
+                # (sendfile) and set Content-Length from it.
+                resp = FileResponse(
+                    open(job.output_file.path, "rb"),
+                    content_type=XLSX_CONTENT_TYPE,
+                    as_attachment=True,
+                    filename=filename,
+                )
+
+            resp["ETag"] = etag
+            if last_modified is not None:
+                resp["Last-Modified"] = http_date(last_modified)
+            resp["Cache-Control"] = "private, no-cache"
             return resp
 
         except AuthenticationError as e:
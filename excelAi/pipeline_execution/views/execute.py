@@ -1,16 +1,27 @@
+import uuid
+
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from django.core.exceptions import PermissionDenied
+from django.utils import timezone
 
 from file_manager.exceptions import AuthenticationError, FileNotFoundError, RequestValidationError
-from file_manager.services import check_authentication, get_file_by_id
+from file_manager.services import check_authentication, get_file_by_id, require_selected_sheet
 
 from ..models import PipelineJob
 from ..services.errors import PipelineValidationError
 from ..services.validation import validate_pipeline_operations
-from ..tasks import execute_pipeline
+from ..tasks import execute_pipeline, link_processed_output
+
+
+def _has_values_only_output(file_record) -> bool:
+    return (
+        file_record.status == "READY"
+        and bool(file_record.processed_file)
+        and not file_record.preserve_styles
+    )
 
 
 class PipelineExecuteView(APIView):
@@ -20,6 +31,9 @@ class PipelineExecuteView(APIView):
     POST body:
     - file_id: UUID (ProcessedFile.file_id)
     - pipeline_operations: list (may be empty)
+
+    An empty pipeline on a processed values-only file completes inline (201);
+    anything else is queued (202).
     """
 
     def post(self, request):
@@ -34,25 +48,72 @@ class PipelineExecuteView(APIView):
 
             validated_ops = validate_pipeline_operations(pipeline_operations)
 
-            file_record = get_file_by_id(str(file_id), clerk_user_id)
-
+            file_record = get_file_by_id(
+                str(file_id),
+                clerk_user_id,
+                fields=(
+                    "status",
+                    "original_file",
+                    "selected_sheet",
+                    "processed_file",
+                    "preserve_styles",
+                ),
+            )
+            require_selected_sheet(file_record)
+
+            if not validated_ops and _has_values_only_output(file_record):
+                # Nothing to run: finish inline from the processed sheet, skipping Celery.
+                now = timezone.now()
+                job = PipelineJob(
+                    file=file_record,
+                    clerk_user_id=clerk_user_id,
+                    pipeline_operations=validated_ops,
+                    status=PipelineJob.Status.SUCCEEDED,
+                    started_at=now,
+                    finished_at=now,
+                )
+                link_processed_output(job, file_record)
+                try:
+                    job.save()
+                except Exception:
+                    # Don't leave an output file behind that no job points to.
+                    job.output_file.delete(save=False)
+                    raise
+
+                # Same keys as the queued response; there is no Celery task, and
+                # the stream reports the finished job immediately.
+                job_id = str(job.job_id)
+                return Response(
+                    {
+                        "job_id": job_id,
+                        "task_id": None,
+                        "status": job.status,
+                        "stream_url": f"/api/pipeline/execution/{job_id}/stream/",
+                        "status_url": f"/api/pipeline/execution/{job_id}/status/",
+                        "download_url": f"/api/pipeline/execution/{job_id}/download/",
+                    },
+                    status=status.HTTP_201_CREATED,
+                )
+
+            # The task id is chosen up front so the row is inserted with it
+            # (no follow-up UPDATE, and streams never see a task-less job).
+            task_id = str(uuid.uuid4())
             job = PipelineJob.objects.create(
                 file=file_record,
                 clerk_user_id=clerk_user_id,
                 pipeline_operations=validated_ops,
                 status=PipelineJob.Status.PENDING,
+                celery_task_id=task_id,
             )
 
-
-            async_result = execute_pipeline.delay(str(job.job_id))
-            job.celery_task_id = async_result.id
-            job.save(update_fields=["celery_task_id", "updated_at"])
+            execute_pipeline.apply_async(args=[str(job.job_id)], task_id=task_id)
 
             job_id = str(job.job_id)
             return Response(
                 {
                     "job_id": job_id,
-                    "task_id": async_result.id,
+                    "task_id": task_id,
+                    "status": job.status,
                     "stream_url": f"/api/pipeline/execution/{job_id}/stream/",
                     "status_url": f"/api/pipeline/execution/{job_id}/status/",
                     "download_url": f"/api/pipeline/execution/{job_id}/download/",
@@ -1,16 +1,20 @@
 from .stream_helpers import (
     connected_event,
     failed_event,
+    get_task_snapshot,
     maybe_emit_job_status_change,
     maybe_emit_task_state_change,
     succeeded_event,
+    terminal_event,
 )
 
 __all__ = [
     "connected_event",
     "failed_event",
+    "get_task_snapshot",
     "maybe_emit_job_status_change",
     "maybe_emit_task_state_change",
     "succeeded_event",
+    "terminal_event",
 ]
 
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-from celery.result import AsyncResult
+from celery import current_app
 
 from ...models import PipelineJob
 from ..sse import sse_event
 
 
-def connected_event(*, job: PipelineJob) -> str:
+def connected_event(*, job: PipelineJob) -> bytes:
     return sse_event(
         event="connected",
         data={
@@ -17,14 +17,14 @@ def connected_event(*, job: PipelineJob) -> str:
     )
 
 
-def _job_status_event(*, job: PipelineJob) -> str:
+def _job_status_event(*, job: PipelineJob) -> bytes:
     return sse_event(
         event="job_status",
         data={"job_id": str(job.job_id), "status": job.status, "error": job.error},
     )
 
 
-def succeeded_event(*, job: PipelineJob, download_url: str) -> str:
+def succeeded_event(*, job: PipelineJob, download_url: str) -> bytes:
     return sse_event(
         event="succeeded",
         data={
@@ -35,7 +35,7 @@ def succeeded_event(*, job: PipelineJob, download_url: str) -> str:
     )
 
 
-def failed_event(*, job: PipelineJob) -> str:
+def failed_event(*, job: PipelineJob) -> bytes:
     return sse_event(
         event="failed",
         data={
@@ -46,7 +46,16 @@ def failed_event(*, job: PipelineJob) -> str:
     )
 
 
-def _task_state_event(*, job: PipelineJob, state: str, meta: dict | None) -> str:
+def terminal_event(*, job: PipelineJob, download_url: str) -> bytes | None:
+    """The closing event of a finished job (succeeded/failed); None while it is not finished."""
+    if job.status == PipelineJob.Status.SUCCEEDED:
+        return succeeded_event(job=job, download_url=download_url)
+    if job.status == PipelineJob.Status.FAILED:
+        return failed_event(job=job)
+    return None
+
+
+def _task_state_event(*, job: PipelineJob, state: str, meta: dict | None) -> bytes:
     return sse_event(
         event="task_state",
         data={
@@ -58,18 +67,26 @@ def _task_state_event(*, job: PipelineJob, state: str, meta: dict | None) -> str
     )
 
 
-def _get_task_snapshot(task_id: str) -> tuple[str, dict | None]:
-    res = AsyncResult(task_id)
-    task_state = res.state
-    task_meta = res.info if isinstance(res.info, dict) else None
-    return task_state, task_meta
+def get_task_snapshot(task_id: str) -> tuple[str, dict | None]:
+    # One backend read: AsyncResult.state and .info each fetch the meta again
+    # until the task is ready.
+    meta = current_app.backend.get_task_meta(task_id)
+    task_info = meta.get("result")
+    return meta["status"], task_info if isinstance(task_info, dict) else None
+
+
+def _same_meta(meta: dict | None, last_meta: dict | None) -> bool:
+    # PROGRESS meta carries a revision counter; anything else is compared as a whole.
+    if meta and last_meta and "rev" in meta and "rev" in last_meta:
+        return meta["rev"] == last_meta["rev"]
+    return meta == last_meta
 
 
 def maybe_emit_job_status_change(
     *,
     job: PipelineJob,
     last_job_status: str | None,
-) -> tuple[str | None, str | None]:
+) -> tuple[bytes | None, str | None]:
     """
     Returns: (event_or_none, new_last_job_status)
     """
@@ -83,15 +100,21 @@ def maybe_emit_task_state_change(
     job: PipelineJob,
     last_task_state: str | None,
     last_task_meta: dict | None,
-) -> tuple[str | None, str | None, dict | None]:
+    snapshot: tuple[str, dict | None] | None = None,
+) -> tuple[bytes | None, str | None, dict | None]:
     """
     Returns: (event_or_none, new_last_task_state, new_last_task_meta)
+
+    `snapshot` is a (state, meta) pair already received (e.g. over pub/sub);
+    without it the result backend is queried.
     """
     if not job.celery_task_id:
         return None, last_task_state, last_task_meta
 
-    task_state, task_meta = _get_task_snapshot(job.celery_task_id)
-    if task_state == last_task_state and task_meta == last_task_meta:
+    if snapshot is None:
+        snapshot = get_task_snapshot(job.celery_task_id)
+    task_state, task_meta = snapshot
+    if task_state == last_task_state and _same_meta(task_meta, last_task_meta):
         return None, last_task_state, last_task_meta
 
     return _task_state_event(job=job, state=task_state, meta=task_meta), task_state, task_meta
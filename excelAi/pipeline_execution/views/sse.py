@@ -1,8 +1,25 @@
 from __future__ import annotations
 
 import json
+from functools import lru_cache
 
+try:
+    import orjson
+except ImportError:  # stdlib json is used when orjson is unavailable
+    orjson = None
 
-def sse_event(*, event: str, data: dict) -> str:
-    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
+def _dumps(data: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+@lru_cache(maxsize=None)
+def _frame_prefix(event: str) -> bytes:
+    # Event names are a handful of constants, so each prefix is encoded only once.
+    return f"event: {event}\ndata: ".encode("utf-8")
+
+
+def sse_event(*, event: str, data: dict) -> bytes:
+    return _frame_prefix(event) + _dumps(data) + b"\n\n"
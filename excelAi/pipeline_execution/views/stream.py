@@ -1,27 +1,40 @@
 from __future__ import annotations
 
-import time
+import json
 
 from django.http import JsonResponse, StreamingHttpResponse
 
 from file_manager.exceptions import AuthenticationError
 from file_manager.services import check_authentication
 
+from ..events import TASK_STATE, job_event_subscription
 from ..models import PipelineJob
 from .helpers.stream_helpers import (
     connected_event,
-    failed_event,
     maybe_emit_job_status_change,
     maybe_emit_task_state_change,
-    succeeded_event,
+    terminal_event,
 )
 
+# Idle streams get an SSE comment this often, so proxies keep the connection open.
+HEARTBEAT_SECONDS = 15
+HEARTBEAT = b": heartbeat\n\n"
+
+# Job columns the events are built from; re-read as a plain row, not a model instance.
+JOB_STREAM_FIELDS = ("status", "error", "celery_task_id")
+
 
 def pipeline_stream(request, job_id):
     """
     Stream pipeline progress as Server-Sent Events (SSE).
 
     Auth: X-Clerk-User-Id header, enforced by job ownership.
+
+    A sync generator, so WSGI servers flush every event as it is yielded; an idle
+    stream blocks on its pub/sub channel rather than polling. Each open stream holds
+    one WSGI worker thread: size the worker pool for the expected number of
+    concurrent streams. (An async view would only help under an ASGI server, which
+    this project does not deploy; under WSGI Django buffers async streams whole.)
     """
     try:
         clerk_user_id = check_authentication(request)
@@ -29,7 +42,7 @@ def pipeline_stream(request, job_id):
         return JsonResponse({"error": str(e)}, status=401)
 
     try:
-        job = PipelineJob.objects.select_related("file").get(job_id=job_id)
+        job = PipelineJob.objects.only("clerk_user_id", *JOB_STREAM_FIELDS).get(job_id=job_id)
     except PipelineJob.DoesNotExist:
         return JsonResponse({"error": "Job not found"}, status=404)
 
@@ -39,6 +52,8 @@ def pipeline_stream(request, job_id):
 
     download_url = f"/api/pipeline/execution/{job_id}/download/"
 
+    jobs = PipelineJob.objects.filter(pk=job.pk)
+
     def event_stream():
         last_task_state = None
         last_task_meta = None
@@ -46,37 +61,65 @@ def pipeline_stream(request, job_id):
 
         yield connected_event(job=job)
 
-        while True:
-            # Prefer DB status (works even when Celery runs eagerly without storing results).
-            job.refresh_from_db(fields=["status", "error", "celery_task_id", "output_file"])
-            maybe_job_event, last_job_status = maybe_emit_job_status_change(
-                job=job,
-                last_job_status=last_job_status,
-            )
-            if maybe_job_event:
-                yield maybe_job_event
-
-            if job.status == PipelineJob.Status.SUCCEEDED:
-                yield succeeded_event(job=job, download_url=download_url)
-                break
-
-            if job.status == PipelineJob.Status.FAILED:
-                yield failed_event(job=job)
-                break
-
-            # If we have a task id and a result backend, also stream PROGRESS meta.
-            maybe_task_event, last_task_state, last_task_meta = maybe_emit_task_state_change(
-                job=job,
-                last_task_state=last_task_state,
-                last_task_meta=last_task_meta,
-            )
-            if maybe_task_event:
-                yield maybe_task_event
-
-            time.sleep(0.5)
+        # A finished job (typically a reconnecting client) is answered from the row
+        # loaded above, without subscribing or querying again.
+        closing_event = terminal_event(job=job, download_url=download_url)
+        if closing_event:
+            yield maybe_emit_job_status_change(job=job, last_job_status=None)[0]
+            yield closing_event
+            return
+
+        # Subscribe before reading the current state so no transition falls in between.
+        with job_event_subscription(job.job_id) as pubsub:
+            check_job = True
+            snapshot = None
+            while True:
+                if check_job:
+                    # Prefer DB status (works even when Celery runs eagerly without storing results).
+                    row = jobs.values(*JOB_STREAM_FIELDS).first()
+                    if row is None:
+                        # Deleted (e.g. its file expired) while streaming.
+                        break
+                    for field, value in row.items():
+                        setattr(job, field, value)
+                    maybe_job_event, last_job_status = maybe_emit_job_status_change(
+                        job=job,
+                        last_job_status=last_job_status,
+                    )
+                    if maybe_job_event:
+                        yield maybe_job_event
+
+                    closing_event = terminal_event(job=job, download_url=download_url)
+                    if closing_event:
+                        yield closing_event
+                        break
+
+                # If we have a task id and a result backend, also stream PROGRESS meta;
+                # the backend is only read when no pushed snapshot is at hand.
+                maybe_task_event, last_task_state, last_task_meta = maybe_emit_task_state_change(
+                    job=job,
+                    last_task_state=last_task_state,
+                    last_task_meta=last_task_meta,
+                    snapshot=snapshot,
+                )
+                if maybe_task_event:
+                    yield maybe_task_event
+
+                # Wait until the worker publishes; on timeout re-check everything, which
+                # also covers messages published while Redis was unreachable.
+                message = pubsub.get_message(timeout=HEARTBEAT_SECONDS)
+                if message is None:
+                    yield HEARTBEAT
+                    check_job, snapshot = True, None
+                    continue
+
+                event = json.loads(message["data"])
+                if event["kind"] == TASK_STATE:
+                    check_job, snapshot = False, (event["state"], event["meta"])
+                else:
+                    check_job, snapshot = True, None
 
     resp = StreamingHttpResponse(event_stream(), content_type="text/event-stream")
     resp["Cache-Control"] = "no-cache"
     resp["X-Accel-Buffering"] = "no"
     return resp
-